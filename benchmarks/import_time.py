@@ -0,0 +1,58 @@
+"""
+
+Import-time benchmark for the fitting API.
+
+Imports powerlaw.regression in fresh interpreters and reports the best wall time. Fails (exit status 1) if matplotlib (or the former scikit-learn dependency) gets imported along with it, or if the import is slower than --max-seconds.
+
+Usage:
+
+    python benchmarks/import_time.py [--repeat 5] [--max-seconds 1.0]
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODULE = "powerlaw.regression"
+# dependencies which should only be loaded on first use of plotting
+LAZY_MODULES = ["matplotlib", "sklearn"]
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": sorted(m for m in {lazy!r} if m in sys.modules)}}))
+"""
+
+def measure(repeat):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = SNIPPET.format(module=MODULE, lazy=LAZY_MODULES)
+    runs = []
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=root)
+        runs.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return runs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    runs = measure(args.repeat)
+    best = min(run["seconds"] for run in runs)
+    loaded = sorted(set(module for run in runs for module in run["loaded"]))
+    print("import %s: best of %d = %.3fs" % (MODULE, args.repeat, best))
+
+    failed = False
+    if loaded:
+        print("FAIL: imported eagerly: " + ", ".join(loaded))
+        failed = True
+    if best > args.max_seconds:
+        print("FAIL: slower than %.3fs" % args.max_seconds)
+        failed = True
+    sys.exit(1 if failed else 0)
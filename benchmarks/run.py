@@ -0,0 +1,136 @@
+"""
+
+Benchmark suite for powerlaw.
+
+Every case is run on seeded synthetic data for a range of sizes and records the best wall time, the peak memory traced by tracemalloc and the throughput (elements per second). Results are saved as JSON. Given a baseline file from an earlier run, cases which got slower by more than the tolerance are flagged and the exit status is 1.
+
+Usage:
+
+    python benchmarks/run.py [--quick] [--cases NAME ...] [--max-size N]
+                             [--output results.json] [--baseline baseline.json] [--tolerance 0.25]
+
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from powerlaw.discrete import discrete_powerlaw_array
+from powerlaw.distribution import exponential_series, frequency_array, frequency_distribution, powerlaw_array, powerlaw_series
+from powerlaw.regression import estimate_parameters, goodness_of_fit
+
+SEED = 12345
+
+def _continuous_data(n):
+    return powerlaw_array(Alpha = 2.5, n = n, xmin = 1.0, seed = SEED)
+
+def _discrete_data(n):
+    return discrete_powerlaw_array(Alpha = 2.5, n = n, xmin = 1, seed = SEED)
+
+def _fitted(n):
+    data = _continuous_data(n)
+    return (data,) + estimate_parameters(data)
+
+# name -> (setup(n) returning the arguments, run(*arguments), sizes, quick sizes)
+CASES = {
+    "powerlaw_series": (lambda n: (n,), lambda n: sum(1 for x in powerlaw_series(Alpha = 2.5, n = n, seed = SEED)),
+                        [10**3, 10**4, 10**5, 10**6, 10**7], [10**3, 10**5]),
+    "exponential_series": (lambda n: (n,), lambda n: sum(1 for x in exponential_series(n = n, seed = SEED)),
+                           [10**3, 10**4, 10**5, 10**6, 10**7], [10**3, 10**5]),
+    "powerlaw_array": (lambda n: (n,), lambda n: powerlaw_array(Alpha = 2.5, n = n, seed = SEED),
+                       [10**3, 10**4, 10**5, 10**6, 10**7], [10**3, 10**5]),
+    "frequency_distribution": (lambda n: (_discrete_data(n),), lambda data: sum(1 for x in frequency_distribution(data, pdf = False)),
+                               [10**3, 10**4, 10**5, 10**6, 10**7], [10**3, 10**5]),
+    "frequency_array": (lambda n: (_discrete_data(n),), lambda data: frequency_array(data, pdf = False),
+                        [10**3, 10**4, 10**5, 10**6, 10**7], [10**3, 10**5]),
+    # the exhaustive search costs O(N*U) for continuous data (U distinct values), so it stops at 3*10^4; larger sizes are covered by coarse_to_fine
+    "estimate_parameters_continuous": (lambda n: (_continuous_data(n),), lambda data: estimate_parameters(data),
+                                       [10**3, 10**4, 3*10**4], [10**3, 10**4]),
+    "estimate_parameters_continuous_coarse_to_fine": (lambda n: (_continuous_data(n),), lambda data: estimate_parameters(data, search = "coarse_to_fine"),
+                                                      [10**3, 10**4, 10**5, 10**6], [10**3, 10**4]),
+    "estimate_parameters_discrete": (lambda n: (_discrete_data(n),), lambda data: estimate_parameters(data, discrete = True),
+                                     [10**3, 10**4, 10**5, 10**6], [10**3, 10**4]),
+    "goodness_of_fit_eps_0.1": (_fitted, lambda data, xmin, alpha, ks: goodness_of_fit(data, xmin, alpha, ks, epsilon = 0.1, seed = SEED),
+                                [10**3, 10**4], [10**3]),
+    "goodness_of_fit_eps_0.05": (_fitted, lambda data, xmin, alpha, ks: goodness_of_fit(data, xmin, alpha, ks, epsilon = 0.05, seed = SEED),
+                                 [10**3, 10**4], [10**3]),
+}
+
+def measure(setup, run, n, repeat):
+    """
+
+    Best wall time over repeat runs and peak traced memory of a single run, for size n.
+
+    """
+
+    arguments = setup(n)
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        run(*arguments)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run(*arguments)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    seconds = min(times)
+    return {"n": n, "seconds": seconds, "peak_bytes": peak, "throughput": n/seconds if seconds > 0 else None}
+
+def compare(results, baseline, tolerance):
+    """
+
+    List of (case, n, baseline seconds, seconds) for the cases slower than baseline by more than tolerance.
+
+    """
+
+    reference = dict(((entry["case"], entry["n"]), entry["seconds"]) for entry in baseline["results"])
+    slowdowns = []
+    for entry in results:
+        key = (entry["case"], entry["n"])
+        if key in reference and entry["seconds"] > reference[key]*(1.0 + tolerance):
+            slowdowns.append((entry["case"], entry["n"], reference[key], entry["seconds"]))
+    return slowdowns
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="*", default=sorted(CASES), choices=sorted(CASES))
+    parser.add_argument("--quick", action="store_true", help="run the small sizes only")
+    parser.add_argument("--max-size", type=int, default=None, help="skip sizes above this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="earlier output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown against the baseline")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.cases:
+        (setup, run, sizes, quick_sizes) = CASES[name]
+        for n in (quick_sizes if args.quick else sizes):
+            if args.max_size is not None and n > args.max_size:
+                continue
+            entry = measure(setup, run, n, args.repeat)
+            entry["case"] = name
+            results.append(entry)
+            print("%-32s n=%-9d %10.4fs %12.1f KiB %14.0f /s" % (name, n, entry["seconds"], entry["peak_bytes"]/1024.0, entry["throughput"] or 0))
+
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(), "results": results}, f, indent=2)
+    print("results saved to " + args.output)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            slowdowns = compare(results, json.load(f), args.tolerance)
+        for (name, n, before, after) in slowdowns:
+            print("SLOWER: %s n=%d %.4fs -> %.4fs (x%.2f)" % (name, n, before, after, after/before))
+        if slowdowns:
+            sys.exit(1)
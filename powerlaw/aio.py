@@ -0,0 +1,121 @@
+"""
+
+Awaitable counterparts of the fitting functions, for use inside asyncio applications. The work runs on an executor so that the event loop is never blocked: None is the default executor of the loop (a thread pool), and any concurrent.futures executor can be given instead. A ProcessPoolExecutor is recommended for long bootstraps, as fitting holds the GIL for a good part of the time.
+
+"""
+
+import numpy as np
+
+from .regression import _bootstrap_ks_chunk, _bootstrap_tasks, _fit_options, _number_of_datasets, estimate_parameters, search_xmin
+
+import asyncio
+from collections import deque, namedtuple
+from functools import partial
+
+BootstrapProgress = namedtuple("BootstrapProgress", ["completed", "total", "exceedances", "p_value"])
+
+async def estimate_parameters_async(series, executor = None, **kwargs):
+    """
+
+    Awaitable `powerlaw.regression.estimate_parameters()`, run on executor. kwargs are passed on to `powerlaw.regression.estimate_parameters()`.
+
+    **Returns**
+
+        Tuple of (Estimated xmin, Estimated Alpha value, minimum KS statistics score).
+
+    """
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(estimate_parameters, series, **kwargs))
+
+async def search_xmin_async(series, executor = None, **kwargs):
+    """
+
+    Awaitable `powerlaw.regression.search_xmin()`, run on executor. kwargs are passed on to `powerlaw.regression.search_xmin()`.
+
+    **Returns**
+
+        XminSearch named tuple of (Estimated xmin, Estimated Alpha value, minimum KS statistics score, number of xmin candidates evaluated).
+
+    """
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(search_xmin, series, **kwargs))
+
+async def iter_goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size_series = 50, discrete = False, executor = None, concurrency = 4, chunk_size = 25, seed = None,
+                               instrumentation = None, search = "exhaustive", max_candidates = 200, xmin_range = None, backend = None):
+    """
+
+    Asynchronous generator running the goodness of fit test of `powerlaw.regression.goodness_of_fit()` on executor, chunk of synthetic datasets by chunk, and yielding the running p-value after every chunk.
+
+    Cancelling the task iterating (or closing the generator with aclose() after leaving the loop early) cancels the chunks not started yet; at most concurrency chunks are in flight at a time.
+
+    **Parameters**
+
+        executor : concurrent.futures executor the chunks are run on. Default value is None, ie the default executor of the event loop.
+
+        concurrency : Number of chunks submitted to executor at a time, eg its number of workers. Default value is 4
+
+        chunk_size : Number of synthetic datasets per chunk, ie between two progress reports. Default value is 25
+
+        seed : See `powerlaw.regression.goodness_of_fit()`. For a given seed, the final p-value is the same as the one of `powerlaw.regression.goodness_of_fit()`, whatever the executor, concurrency and chunk_size.
+
+        For the other parameters, see `powerlaw.regression.goodness_of_fit()`.
+
+    **Returns**
+
+        An asynchronous generator of BootstrapProgress named tuples of (number of synthetic datasets completed, total number of synthetic datasets, number of them with a KS statistics greater than the one of the data, running p-value).
+
+    """
+
+    loop = asyncio.get_running_loop()
+    number_of_datasets = _number_of_datasets(epsilon)
+    if(instrumentation is not None):
+        instrumentation.bootstrap_started(number_of_datasets)
+    tasks = _bootstrap_tasks(series, xmin, alpha, number_of_datasets, _fit_options(min_size_series, discrete, search, max_candidates, xmin_range, backend), chunk_size,
+                             seed = seed, timed = instrumentation is not None)
+
+    count_dataset = 0
+    n1 = 0
+
+    def report(result):
+        nonlocal count_dataset, n1
+        (fits, phase_seconds, peak_memory) = result
+        count_dataset += len(fits)
+        n1 += int(np.count_nonzero(fits[:, 2]>ks_statistics))
+        if(instrumentation is not None):
+            for (phase, seconds) in phase_seconds.items():
+                instrumentation.phase_finished(phase, seconds)
+            instrumentation.datasets_completed(count_dataset, number_of_datasets, n1)
+        return BootstrapProgress(count_dataset, number_of_datasets, n1, float(n1)/count_dataset)
+
+    pending = deque()
+    try:
+        for task in tasks:
+            pending.append(loop.run_in_executor(executor, _bootstrap_ks_chunk, task))
+            if(len(pending) >= concurrency):
+                yield report(await pending.popleft())
+        while pending:
+            yield report(await pending.popleft())
+    finally:
+        for future in pending:
+            future.cancel()
+
+async def goodness_of_fit_async(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size_series = 50, discrete = False, executor = None, concurrency = 4, chunk_size = 25, seed = None,
+                                instrumentation = None, search = "exhaustive", max_candidates = 200, xmin_range = None, backend = None):
+    """
+
+    Awaitable `powerlaw.regression.goodness_of_fit()`. Cancelling the awaiting task stops the test at once: chunks not started yet are cancelled and the ones already running on executor finish in the background. See `iter_goodness_of_fit()` for the parameters, and to follow the running p-value.
+
+    **Returns**
+
+        p-value for the fitted model.
+
+    """
+
+    p_value = None
+    async for progress in iter_goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = epsilon, min_size_series = min_size_series, discrete = discrete, executor = executor,
+                                               concurrency = concurrency, chunk_size = chunk_size, seed = seed, instrumentation = instrumentation,
+                                               search = search, max_candidates = max_candidates, xmin_range = xmin_range, backend = backend):
+        p_value = progress.p_value
+    return p_value
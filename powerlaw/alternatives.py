@@ -0,0 +1,321 @@
+"""
+
+Alternative heavy-tailed models for the tail x >= xmin and likelihood ratio tests against the power-law, as in section 5 of Clauset et al. All the distributions are in their continuous form.
+
+Log-likelihood functions return the log-likelihood of every point as a numpy array, which is what the Vuong test needs; their sum is the log-likelihood of the tail.
+
+"""
+
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+from scipy.special import erfc, exp1, gammaincc, gammaln, log_ndtr
+
+from collections import namedtuple
+from math import log, pi, sqrt
+
+# maximum number of terms of the continued fraction of the incomplete gamma function
+_MAX_ITERATIONS = 10000
+# value of a negative log-likelihood which is not finite, so that the optimizers never see inf or NaN
+_PENALTY = 1e300
+
+def powerlaw_log_likelihood(tail, xmin, Alpha):
+    """
+
+    Pointwise log-likelihood of the power-law p(x) = (Alpha-1)/xmin (x/xmin)^-Alpha.
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    return log(Alpha - 1.0) - log(xmin) - Alpha*np.log(tail/xmin)
+
+def exponential_log_likelihood(tail, xmin, Lambda):
+    """
+
+    Pointwise log-likelihood of the exponential distribution p(x) = Lambda exp(-Lambda (x - xmin)).
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    return log(Lambda) - Lambda*(tail - xmin)
+
+def stretched_exponential_log_likelihood(tail, xmin, Lambda, Beta):
+    """
+
+    Pointwise log-likelihood of the stretched exponential distribution p(x) = Beta Lambda x^(Beta-1) exp(-Lambda (x^Beta - xmin^Beta)).
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    return log(Beta) + log(Lambda) + (Beta - 1.0)*np.log(tail) - Lambda*(np.power(tail, Beta) - xmin**Beta)
+
+def lognormal_log_likelihood(tail, xmin, mu, sigma):
+    """
+
+    Pointwise log-likelihood of the lognormal distribution with parameters mu and sigma, truncated to x >= xmin.
+
+    """
+
+    log_tail = np.log(np.asarray(tail, dtype=float))
+    # P(X >= xmin) = P(Z > (log(xmin) - mu)/sigma), in log space for tails far from mu
+    log_normalizer = log_ndtr(-(log(xmin) - mu)/sigma)
+    return -log_tail - log(sigma) - 0.5*log(2.0*pi) - (log_tail - mu)**2/(2.0*sigma**2) - log_normalizer
+
+def _log_upper_incomplete_gamma(a, z):
+    """
+
+    log of the upper incomplete gamma function Gamma(a, z) for any real a and z > 0, computed in log space so that it neither overflows nor underflows for large |a| or z.
+
+    With Gamma(a, z) = z^a exp(-z) r(a, z), log Gamma(a, z) = a log(z) - z + log(r(a, z)), where r is of moderate size:
+        a > 0 and z < a+1 : the regularized gammaincc is not small there and is used directly.
+        z >= 1 (and z >= a+1) : r is the continued fraction of Gamma(a, z), evaluated with the modified Lentz method.
+        z < 1 and a <= 0 : r follows from r(a, z) = (z r(a+1, z) - 1)/a, from a + ceil(-a) in [0, 1) down to a, which is stable there.
+
+    """
+
+    if a > 0 and z < a + 1.0:
+        return log(gammaincc(a, z)) + gammaln(a)
+    if z >= 1.0:
+        tiny = 1e-300
+        b = z + 1.0 - a
+        c = 1.0/tiny
+        d = 1.0/b
+        ratio = d
+        for i in range(1, _MAX_ITERATIONS + 1):
+            an = -i*(i - a)
+            b += 2.0
+            d = an*d + b
+            d = d if abs(d) > tiny else tiny
+            c = b + an/c
+            c = c if abs(c) > tiny else tiny
+            d = 1.0/d
+            delta = d*c
+            ratio *= delta
+            if abs(delta - 1.0) < 1e-15:
+                break
+        return a*log(z) - z + log(ratio)
+    shift = int(np.ceil(-a))
+    b = a + shift
+    if b == 0:
+        ratio = exp1(z)*np.exp(z)
+    else:
+        ratio = gammaincc(b, z)*np.exp(gammaln(b) + z - b*log(z))
+    for i in range(shift):
+        b -= 1.0
+        ratio = (z*ratio - 1.0)/b
+    return a*log(z) - z + log(ratio)
+
+def truncated_powerlaw_log_likelihood(tail, xmin, Alpha, Lambda):
+    """
+
+    Pointwise log-likelihood of the power-law with exponential cutoff p(x) = Lambda^(1-Alpha)/Gamma(1-Alpha, Lambda xmin) x^-Alpha exp(-Lambda x).
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    log_normalizer = (Alpha - 1.0)*log(Lambda) + _log_upper_incomplete_gamma(1.0 - Alpha, Lambda*xmin)
+    return -Alpha*np.log(tail) - Lambda*tail - log_normalizer
+
+def _finite(function):
+    """
+
+    function with its non-finite values replaced by _PENALTY.
+
+    """
+
+    def wrapped(parameters):
+        value = function(parameters)
+        return value if np.isfinite(value) else _PENALTY
+    return wrapped
+
+def _minimize(negative_log_likelihood, start):
+    """
+
+    Minimize a negative log-likelihood with Nelder-Mead from start.
+
+    Parameters reached at the iteration limit are kept: the likelihood can be maximal only in the limit of diverging parameters, eg a lognormal with mu -> -inf and sigma -> inf fitted to power-law data, and the likelihood ratio is then still meaningful.
+
+    **Returns**
+
+        numpy array of the parameters, all NaN if the optimizer did not reach a finite value (eg it never left a start where the likelihood is 0) or failed for another reason than the iteration limit.
+
+    """
+
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        result = minimize(_finite(negative_log_likelihood), start, method="Nelder-Mead", options={"xatol": 1e-8, "fatol": 1e-10, "maxiter": 2000})
+    # status 1 and 2 of Nelder-Mead: maximum number of function evaluations or iterations reached
+    if not (result.success or result.status in (1, 2)) or result.fun >= _PENALTY or not np.all(np.isfinite(result.x)):
+        return np.full(len(start), np.nan)
+    return result.x
+
+def fit_exponential(tail, xmin):
+    """
+
+    MLE of the exponential distribution above xmin.
+
+    **Returns**
+
+        Tuple of (Lambda,).
+
+    """
+
+    return (1.0/np.mean(np.asarray(tail, dtype=float) - xmin),)
+
+def fit_stretched_exponential(tail, xmin):
+    """
+
+    MLE of the stretched exponential distribution above xmin. For a given Beta, the MLE of Lambda is closed-form, so only the profile likelihood in Beta is maximized numerically.
+
+    **Returns**
+
+        Tuple of (Lambda, Beta), NaN if the fit did not converge.
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    n = len(tail)
+    sum_log = np.sum(np.log(tail))
+    # scaled by xmin to keep the powers in range
+    scaled = tail/xmin
+
+    def profile(Beta):
+        Lambda_scaled = n/np.sum(np.power(scaled, Beta) - 1.0)
+        return -(n*log(Beta) + n*log(Lambda_scaled) - n*Beta*log(xmin) + (Beta - 1.0)*sum_log - n)
+
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        result = minimize_scalar(_finite(profile), bounds=(1e-3, 10.0), method="bounded")
+        Beta = result.x
+        Lambda = n/np.sum(np.power(scaled, Beta) - 1.0)/xmin**Beta
+    if not result.success or result.fun >= _PENALTY or not np.isfinite(Lambda) or Lambda <= 0:
+        return (np.nan, np.nan)
+    return (Lambda, Beta)
+
+def fit_lognormal(tail, xmin):
+    """
+
+    MLE of the lognormal distribution truncated to x >= xmin.
+
+    **Returns**
+
+        Tuple of (mu, sigma), NaN if the fit did not converge.
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    log_tail = np.log(tail)
+
+    def negative_log_likelihood(parameters):
+        return -np.sum(lognormal_log_likelihood(tail, xmin, parameters[0], np.exp(parameters[1])))
+
+    start = (np.mean(log_tail), log(max(np.std(log_tail), 1e-3)))
+    (mu, log_sigma) = _minimize(negative_log_likelihood, start)
+    return (mu, np.exp(log_sigma))
+
+def fit_truncated_powerlaw(tail, xmin, Alpha = None):
+    """
+
+    MLE of the power-law with exponential cutoff above xmin.
+
+    **Parameters**
+
+        Alpha : Alpha of the power-law fitted to the same tail, used as a starting point. Default value is None
+
+    **Returns**
+
+        Tuple of (Alpha, Lambda), NaN if the fit did not converge.
+
+    """
+
+    tail = np.asarray(tail, dtype=float)
+    if Alpha is None:
+        Alpha = 1.0 + len(tail)/np.sum(np.log(tail/xmin))
+
+    def negative_log_likelihood(parameters):
+        return -np.sum(truncated_powerlaw_log_likelihood(tail, xmin, parameters[0], np.exp(parameters[1])))
+
+    start = (Alpha, log(0.01/np.mean(tail)))
+    (Alpha, log_Lambda) = _minimize(negative_log_likelihood, start)
+    return (Alpha, np.exp(log_Lambda))
+
+# name -> (fit function, log-likelihood function, whether the power-law is nested in the model)
+ALTERNATIVES = {
+    "exponential": (fit_exponential, exponential_log_likelihood, False),
+    "stretched_exponential": (fit_stretched_exponential, stretched_exponential_log_likelihood, False),
+    "lognormal": (fit_lognormal, lognormal_log_likelihood, False),
+    "truncated_powerlaw": (fit_truncated_powerlaw, truncated_powerlaw_log_likelihood, True),
+}
+
+LikelihoodRatio = namedtuple("LikelihoodRatio", ["R", "p_value", "normalized_R", "parameters"])
+
+def vuong_test(log_likelihood_1, log_likelihood_2, nested = False):
+    """
+
+    Likelihood ratio test between two models fitted to the same data (Vuong's method).
+
+    **Parameters**
+
+        log_likelihood_1 : numpy array of pointwise log-likelihoods under the first model.
+
+        log_likelihood_2 : numpy array of pointwise log-likelihoods under the second model.
+
+        nested : Boolean. If True, the first model is a special case of the second one (eg power-law and power-law with cutoff) and the p-value comes from the chi-squared distribution with one degree of freedom instead. Default value is False
+
+    **Returns**
+
+        Tuple of (log-likelihood ratio R, p-value, normalized R). R > 0 favours the first model; the sign of R is only significant when the p-value is small (eg < 0.1). All three are NaN if a log-likelihood is not finite, eg for a model which failed to fit.
+
+    """
+
+    difference = np.asarray(log_likelihood_1) - np.asarray(log_likelihood_2)
+    if not np.all(np.isfinite(difference)):
+        return (np.nan, np.nan, np.nan)
+    n = len(difference)
+    R = float(np.sum(difference))
+    sigma = float(np.std(difference))
+    normalized_R = R/(sigma*sqrt(n)) if sigma > 0 else 0.0
+    if nested:
+        p_value = float(erfc(sqrt(abs(R))))
+    else:
+        p_value = float(erfc(abs(normalized_R)/sqrt(2.0))) if sigma > 0 else 1.0
+    return (R, p_value, normalized_R)
+
+def compare_distributions(series, xmin, Alpha = None, alternatives = ("exponential", "stretched_exponential", "lognormal", "truncated_powerlaw")):
+    """
+
+    Compare the power-law fitted to the tail x >= xmin of a series with alternative heavy-tailed models, by likelihood ratio tests.
+
+    **Parameters**
+
+        series : series of data.
+
+        xmin : xmin of the fitted power-law, eg from `powerlaw.regression.estimate_parameters()`.
+
+        Alpha : Alpha of the fitted power-law. Default value is None, in which case it is the MLE for xmin.
+
+        alternatives : names of the models to compare with, among the keys of ALTERNATIVES.
+
+    **Returns**
+
+        dict of name -> LikelihoodRatio named tuple of (R, p-value, normalized R, fitted parameters of the alternative). R > 0 favours the power-law. If the fit of an alternative does not converge, its parameters, R, p-value and normalized R are NaN.
+
+    """
+
+    series = np.asarray(series, dtype=float)
+    tail = series[series >= xmin]
+    if Alpha is None:
+        Alpha = 1.0 + len(tail)/np.sum(np.log(tail/xmin))
+    powerlaw = powerlaw_log_likelihood(tail, xmin, Alpha)
+
+    result = {}
+    for name in alternatives:
+        (fit, log_likelihood, nested) = ALTERNATIVES[name]
+        if name == "truncated_powerlaw":
+            parameters = fit(tail, xmin, Alpha = Alpha)
+        else:
+            parameters = fit(tail, xmin)
+        if np.all(np.isfinite(parameters)):
+            with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+                (R, p_value, normalized_R) = vuong_test(powerlaw, log_likelihood(tail, xmin, *parameters), nested = nested)
+        else:
+            (R, p_value, normalized_R) = (np.nan, np.nan, np.nan)
+        result[name] = LikelihoodRatio(R, p_value, normalized_R, tuple(float(parameter) for parameter in parameters))
+    return result
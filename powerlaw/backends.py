@@ -0,0 +1,140 @@
+"""
+
+Registry of engines for the xmin scan of `powerlaw.regression.estimate_parameters()` (and so of `powerlaw.regression.goodness_of_fit()`, `powerlaw.regression.bootstrap()` and `powerlaw.batch.fit_many()`, which fit many synthetic datasets or series).
+
+"numpy" is the vectorized implementation of `powerlaw.regression` and is always available. "numba" compiles a fused kernel which computes the MLE and the KS statistics of every xmin candidate in one pass over the tail of the candidate, without allocating any temporary array (so the exhaustive search still costs O(N*U), see `powerlaw.regression.estimate_parameters()`). "numba" is always registered but is only available when numba can be imported: it is then left out of `available_backends()` and "auto", and asking for it by name raises ValueError. Both give the same results up to floating point rounding. A backend only handles continuous fits; discrete fits always use "numpy".
+
+A function taking a backend name also accepts "auto" (the fastest available backend) and None (the default backend, see `set_backend()`).
+
+"""
+
+import numpy as np
+
+from collections import OrderedDict
+from math import exp
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def _fused_scan(log_values, count_ge, log_sum_ge, indices, alphas, ks_statistics):
+    """
+
+    MLE and KS statistics of the continuous power-law for the xmin candidates of distinct indices, in one pass over the tail of each candidate and without temporary arrays. Plain Python, compiled by numba when it is available.
+
+    **Parameters**
+
+        log_values, count_ge, log_sum_ge : numpy arrays of log(distinct values), number of values >= each distinct value and sum of log(x) over them, see `powerlaw.prepared.PreparedSeries`.
+
+        indices : numpy array of the indices of the xmin candidates.
+
+        alphas, ks_statistics : numpy arrays the results are written into, one entry per candidate.
+
+    """
+
+    size = len(count_ge)
+    for counter in range(len(indices)):
+        index = indices[counter]
+        tail_size = float(count_ge[index])
+        alpha = 1.0 + tail_size/(log_sum_ge[index] - tail_size*log_values[index])
+        alphas[counter] = alpha
+        distance = 0.0
+        for j in range(index, size):
+            difference = abs(count_ge[j]/tail_size - exp((1.0 - alpha)*(log_values[j] - log_values[index])))
+            if(difference > distance):
+                distance = difference
+        ks_statistics[counter] = distance
+
+_compiled_scan = None
+
+def _numba_scan(log_values, count_ge, log_sum_ge, indices):
+    """
+
+    "numba" backend: `_fused_scan()` compiled on first use. The GIL is released while it runs, so that fits in threads (eg `powerlaw.aio`) run in parallel.
+
+    """
+
+    global _compiled_scan
+    if(_compiled_scan is None):
+        _compiled_scan = numba.njit(cache=True, nogil=True)(_fused_scan)
+    alphas = np.empty(len(indices))
+    ks_statistics = np.empty(len(indices))
+    _compiled_scan(log_values, count_ge, log_sum_ge, np.ascontiguousarray(indices, dtype=np.int64), alphas, ks_statistics)
+    return (alphas, ks_statistics)
+
+# name -> (scan function or None for the built-in numpy implementation, function telling whether the backend can be used), fastest first for "auto"
+_BACKENDS = OrderedDict()
+_default_backend = "auto"
+
+def register_backend(name, scan, is_available = None, fastest = False):
+    """
+
+    Add (or replace) a backend.
+
+    **Parameters**
+
+        name : String, name of the backend.
+
+        scan : function (log_values, count_ge, log_sum_ge, indices) -> (numpy array of alphas, numpy array of KS statistics) for continuous fits. See `_fused_scan()` for the meaning of the arguments.
+
+        is_available : function with no argument telling whether the backend can be used, eg whether its dependencies are installed. Default value is None, ie always available.
+
+        fastest : Boolean. If True, the backend is tried first by "auto". Default value is False
+
+    """
+
+    _BACKENDS[name] = (scan, is_available or (lambda: True))
+    if(fastest):
+        _BACKENDS.move_to_end(name, last=False)
+
+def available_backends():
+    """
+
+    Names of the backends which can be used, fastest first.
+
+    """
+
+    return [name for (name, (scan, is_available)) in _BACKENDS.items() if is_available()]
+
+def set_backend(name):
+    """
+
+    Set the backend used when None is given, "auto" being the initial default. Process pools started afterwards by `powerlaw.regression.goodness_of_fit()` and `powerlaw.batch.fit_many()` use it as well.
+
+    """
+
+    global _default_backend
+    resolve_backend(name)
+    _default_backend = name
+
+def resolve_backend(name = None):
+    """
+
+    Name of the backend to use for name: the default backend for None, the fastest available backend for "auto".
+
+    Raises ValueError for an unknown or unavailable backend.
+
+    """
+
+    if(name is None):
+        name = _default_backend
+    if(name == "auto"):
+        return available_backends()[0]
+    if(name not in _BACKENDS):
+        raise ValueError("backend should be one of auto, "+", ".join(_BACKENDS)+", got "+str(name))
+    if(not _BACKENDS[name][1]()):
+        raise ValueError("backend "+name+" is not available, available backends are "+", ".join(available_backends()))
+    return name
+
+def get_scan(name = None):
+    """
+
+    Scan function of a backend (see `register_backend()`), or None for the built-in numpy implementation.
+
+    """
+
+    return _BACKENDS[resolve_backend(name)][0]
+
+register_backend("numpy", None)
+register_backend("numba", _numba_scan, is_available = lambda: numba is not None, fastest = True)
@@ -0,0 +1,126 @@
+import numpy as np
+
+from .backends import resolve_backend
+from .regression import _estimate_sorted, goodness_of_fit
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+import os
+import sys
+
+BatchFit = namedtuple("BatchFit", ["xmin", "alpha", "ks_statistics", "n_tail", "p_value"])
+BatchFit.__doc__ = """
+
+Columnar result of `fit_many()`: every field is a numpy array with one entry per series. Series which could not be fitted have NaN xmin, alpha, KS statistics and p-value and a n_tail of 0. p-values are NaN unless goodness of fit was asked for. Use `_asdict()` to get a dict of columns, eg for pandas.DataFrame.
+
+"""
+
+def _series_seed(entropy, index):
+    """
+
+    Integer seed for the goodness_of_fit test of the index-th series, independent of how the series are split among workers.
+
+    """
+
+    return int(np.random.SeedSequence(entropy, spawn_key=(index,)).generate_state(1, np.uint64)[0])
+
+def _fit_chunk(task):
+    """
+
+    Fit a list of sorted series. This is the unit of work shipped to the worker processes by `fit_many()`.
+
+    **Parameters**
+
+        task : Tuple of (list of sorted numpy arrays, index of the first series, min_size_series, discrete, with_goodness_of_fit, epsilon, entropy, backend).
+
+    **Returns**
+
+        numpy array with one row of (xmin, alpha, KS statistics, n_tail, p-value) per series.
+
+    """
+
+    (sorted_series_list, first_index, min_size_series, discrete, with_goodness_of_fit, epsilon, entropy, backend) = task
+    result = np.full((len(sorted_series_list), 5), np.nan)
+    for (counter, sorted_series) in enumerate(sorted_series_list):
+        (xmin, alpha, ks_statistics) = _estimate_sorted(sorted_series, min_size_series = min_size_series, discrete = discrete, backend = backend)
+        if(ks_statistics == sys.maxsize):
+            result[counter, 3] = 0
+            continue
+        n_tail = len(sorted_series) - np.searchsorted(sorted_series, xmin)
+        result[counter, :4] = (xmin, alpha, ks_statistics, n_tail)
+        if(with_goodness_of_fit):
+            result[counter, 4] = goodness_of_fit(sorted_series, xmin, alpha, ks_statistics, epsilon = epsilon, min_size_series = min_size_series,
+                                                 discrete = discrete, seed = _series_seed(entropy, first_index + counter), backend = backend)
+    return result
+
+def fit_many(series_list = None, values = None, offsets = None, min_size_series = 50, discrete = False, with_goodness_of_fit = False, epsilon = 0.01, n_jobs = 1, chunk_size = None, seed = None, backend = None):
+    """
+
+    Apply Clauset et al.'s method to many independent series at once, eg one series per customer, per endpoint or per day.
+
+    All the series are sorted together with a single vectorized sort and are then fitted with the same engine as `powerlaw.regression.estimate_parameters()`, either in the calling process or over a process pool.
+
+    **Parameters**
+
+        series_list : List of series of data to be fit. Either this or values and offsets should be given.
+
+        values : Ragged array, ie numpy array of the values of all the series one after the other.
+
+        offsets : numpy array of k+1 positions in values, series i being values[offsets[i]:offsets[i+1]].
+
+        min_size_series : See `powerlaw.regression.estimate_parameters()`. Default value is 50.
+
+        discrete : Boolean, whether to treat series as discrete or continous. Default value is False
+
+        with_goodness_of_fit : Boolean. If True, `powerlaw.regression.goodness_of_fit()` is also run for every fitted series. Default value is False
+
+        epsilon : desired accuracy in p-value, used if with_goodness_of_fit is True. Default is set to 0.01.
+
+        n_jobs : Number of worker processes the series are spread over. Default is 1 (no process pool). None or a negative value uses all CPUs.
+
+        chunk_size : Number of series handed to a worker at a time. Default is None, which gives about four chunks per worker.
+
+        seed : Integer to make the p-values reproducible, whatever the value of n_jobs and chunk_size. Default is None.
+
+        backend : Engine the series are fitted with, see `powerlaw.regression.estimate_parameters()`. Default value is None, ie the default backend of the calling process, which the workers use as well.
+
+    **Returns**
+
+        BatchFit named tuple of columns (xmin, alpha, ks_statistics, n_tail, p_value).
+
+    """
+
+    if(series_list is not None):
+        series_list = [np.asarray(series) for series in series_list]
+        offsets = np.concatenate(([0], np.cumsum([len(series) for series in series_list]))).astype(np.int64)
+        values = np.concatenate(series_list) if len(series_list) else np.zeros(0)
+    elif(values is None or offsets is None):
+        raise ValueError("Either series_list or both values and offsets should be given")
+    values = np.asarray(values)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    number_of_series = len(offsets) - 1
+
+    # one sort for all the series: by series first, then by value
+    segment = np.repeat(np.arange(number_of_series), np.diff(offsets))
+    sorted_values = values[offsets[0]:offsets[-1]][np.lexsort((values[offsets[0]:offsets[-1]], segment))]
+    bounds = offsets - offsets[0]
+    sorted_series_list = [sorted_values[bounds[i]:bounds[i + 1]] for i in range(number_of_series)]
+
+    if(n_jobs is None or n_jobs < 0):
+        n_jobs = os.cpu_count() or 1
+    if(chunk_size is None):
+        chunk_size = max(int(ceil(float(number_of_series)/(4*n_jobs))), 1)
+    entropy = np.random.SeedSequence(seed).entropy
+    backend = resolve_backend(backend)
+    tasks = [(sorted_series_list[start:start + chunk_size], start, min_size_series, discrete, with_goodness_of_fit, epsilon, entropy, backend)
+             for start in range(0, number_of_series, chunk_size)]
+
+    if(n_jobs == 1):
+        chunks = [_fit_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers = n_jobs) as executor:
+            chunks = list(executor.map(_fit_chunk, tasks))
+
+    result = np.concatenate(chunks) if chunks else np.zeros((0, 5))
+    return BatchFit(result[:, 0], result[:, 1], result[:, 2], result[:, 3].astype(np.int64), result[:, 4])
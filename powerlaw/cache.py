@@ -0,0 +1,179 @@
+import numpy as np
+
+from .prepared import PreparedSeries
+from .regression import estimate_parameters, goodness_of_fit
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+
+def fingerprint(series):
+    """
+
+    Fast content hash of a series: BLAKE2b of its raw bytes, dtype and length. Two series have the same fingerprint if and only if (barring hash collisions) they hold the same values in the same order with the same dtype.
+
+    **Parameters**
+
+        series : list or numpy array of values, or `powerlaw.prepared.PreparedSeries`, which is hashed by its sorted values (or by its distinct values, counts and sums of log(x) if built from a histogram).
+
+    **Returns**
+
+        Hexadecimal string.
+
+    """
+
+    if(isinstance(series, PreparedSeries)):
+        arrays = [series.sorted_series] if series.sorted_series is not None else [series.distinct_values, series.counts, series.log_sum_ge]
+    else:
+        arrays = [series]
+    digest = hashlib.blake2b(digest_size=20)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype.str, array.shape)).encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+# prefix of the files written to the cache directory, so that clear() leaves any other file alone
+_FILE_PREFIX = "powerlaw-cache-"
+
+def _json_default(value):
+    """
+
+    JSON encoding of numpy scalars and arrays, so that eg numpy.int64(3) and 3 give the same cache key.
+
+    """
+
+    if(isinstance(value, (np.generic, np.ndarray))):
+        return value.tolist()
+    raise TypeError("Object of type "+type(value).__name__+" is not JSON serializable")
+
+class FitCache(object):
+    """
+
+    Opt-in cache of fitted models, so that refitting unchanged data (eg a dashboard refresh or a retried job) returns instantly.
+
+    Results of `estimate_parameters()` and `goodness_of_fit()` are keyed by the fingerprint of the series and every parameter of the fit (min_size_series, discrete, epsilon, seed, ...). At most maxsize results are kept in memory, the least recently used being evicted first. If a directory is given, results are also written there as small JSON files (named powerlaw-cache-*.json), so that they survive process restarts.
+
+    Note that `goodness_of_fit()` with seed None draws fresh random numbers on every call; once cached, the same p-value is returned for the same data.
+
+    **Parameters**
+
+        maxsize : Integer, maximum number of results kept in memory. Default value is 1024
+
+        directory : path of a directory to persist results in. It is created if needed. Default value is None, ie memory only.
+
+    """
+
+    def __init__(self, maxsize = 1024, directory = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _key(self, function, series, parameters):
+        return json.dumps([function, fingerprint(series), parameters], sort_keys=True, default=_json_default)
+
+    def _path(self, key):
+        return os.path.join(self.directory, _FILE_PREFIX + hashlib.blake2b(key.encode(), digest_size=20).hexdigest() + ".json")
+
+    def get(self, key):
+        """
+
+        Cached value for key, or None. A hit moves the entry to the most recently used position.
+
+        """
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            if entry["key"] == key:
+                self.hits += 1
+                self._store(key, entry["value"])
+                return entry["value"]
+        self.misses += 1
+        return None
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def put(self, key, value):
+        """
+
+        Cache value (JSON serializable) for key, in memory and on disk if a directory was given.
+
+        """
+
+        self._store(key, value)
+        if self.directory is not None:
+            path = self._path(key)
+            with open(path + ".tmp", "w") as f:
+                json.dump({"key": key, "value": value}, f)
+            os.replace(path + ".tmp", path)
+
+    def clear(self):
+        """
+
+        Drop every cached result, from memory and from the directory. Only the files written by the cache are removed.
+
+        """
+
+        self._entries.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.startswith(_FILE_PREFIX):
+                    os.remove(os.path.join(self.directory, name))
+
+    def estimate_parameters(self, series, min_size_series = 50, discrete = False, search = "exhaustive", max_candidates = 200, xmin_range = None):
+        """
+
+        Cached `powerlaw.regression.estimate_parameters()`.
+
+        **Returns**
+
+            Tuple of (Estimated xmin, Estimated Alpha value, minimum KS statistics score).
+
+        """
+
+        parameters = {"min_size_series": min_size_series, "discrete": bool(discrete), "search": search, "max_candidates": max_candidates,
+                      "xmin_range": None if xmin_range is None else list(xmin_range)}
+        key = self._key("estimate_parameters", series, parameters)
+        value = self.get(key)
+        if value is None:
+            value = list(estimate_parameters(series, min_size_series = min_size_series, discrete = discrete, search = search,
+                                             max_candidates = max_candidates, xmin_range = xmin_range))
+            self.put(key, value)
+        return tuple(value)
+
+    def goodness_of_fit(self, series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size_series = 50, discrete = False, seed = None, n_jobs = 1,
+                        search = "exhaustive", max_candidates = 200, xmin_range = None):
+        """
+
+        Cached `powerlaw.regression.goodness_of_fit()`. n_jobs is not part of the key, as it does not change the p-value for a given seed.
+
+        **Returns**
+
+            p-value for the fitted model.
+
+        """
+
+        parameters = {"xmin": xmin, "alpha": alpha, "ks_statistics": ks_statistics, "epsilon": epsilon, "min_size_series": min_size_series,
+                      "discrete": bool(discrete), "seed": seed, "search": search, "max_candidates": max_candidates,
+                      "xmin_range": None if xmin_range is None else list(xmin_range)}
+        key = self._key("goodness_of_fit", series, parameters)
+        value = self.get(key)
+        if value is None:
+            value = goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = epsilon, min_size_series = min_size_series, discrete = discrete,
+                                    seed = seed, n_jobs = n_jobs, search = search, max_candidates = max_candidates, xmin_range = xmin_range)
+            self.put(key, value)
+        return value
@@ -0,0 +1,59 @@
+import numpy as np
+
+import json
+import os
+
+def save_checkpoint(path, parameters, entropy, ks_statistics):
+    """
+
+    Save the state of a bootstrap to path, atomically: the file is written next to path and then renamed over it, so a run killed while saving leaves the previous checkpoint intact.
+
+    **Parameters**
+
+        path : path of the checkpoint file, as a string or os.PathLike (eg pathlib.Path). A .npz extension is added by numpy if missing.
+
+        parameters : dict of the parameters of the test (JSON serializable), checked when resuming.
+
+        entropy : Integer, root entropy the synthetic datasets are seeded from.
+
+        ks_statistics : numpy array of KS statistics of the synthetic datasets completed so far, in dataset order.
+
+    """
+
+    path = os.fspath(path)
+    if not path.endswith(".npz"):
+        path = path + ".npz"
+    state = {"parameters": parameters, "entropy": str(entropy)}
+    temporary_path = path + ".tmp.npz"
+    np.savez(temporary_path, ks_statistics=np.asarray(ks_statistics, dtype=float), state=np.array(json.dumps(state, sort_keys=True)))
+    os.replace(temporary_path, path)
+
+def load_checkpoint(path, parameters):
+    """
+
+    Load the state of a bootstrap saved by `save_checkpoint()`.
+
+    **Parameters**
+
+        path : path of the checkpoint file, as a string or os.PathLike.
+
+        parameters : dict of the parameters of the test being resumed. They should match the ones of the checkpoint.
+
+    **Returns**
+
+        Tuple of (root entropy, numpy array of KS statistics of the synthetic datasets completed), or None if there is no checkpoint yet.
+
+    """
+
+    path = os.fspath(path)
+    if not path.endswith(".npz"):
+        path = path + ".npz"
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as checkpoint:
+        state = json.loads(str(checkpoint["state"]))
+        ks_statistics = checkpoint["ks_statistics"]
+    # round trip through JSON so that eg tuples and lists compare equal
+    if state["parameters"] != json.loads(json.dumps(parameters, sort_keys=True)):
+        raise ValueError("Checkpoint "+path+" was saved for different parameters: "+json.dumps(state["parameters"], sort_keys=True))
+    return (int(state["entropy"]), ks_statistics)
@@ -0,0 +1,201 @@
+import numpy as np
+from scipy.special import zeta
+
+from functools import lru_cache
+
+_GOLDEN_RATIO = (np.sqrt(5.0) - 1.0)/2.0
+# number of golden section steps, enough to shrink the bracket below 1e-10
+_MLE_ITERATIONS = 60
+# values below xmin + _TABLE_SIZE are sampled from a table, the rest by rejection
+_TABLE_SIZE = 1024
+
+def hurwitz_zeta(alpha, values):
+    """
+
+    Vectorized Hurwitz zeta function, zeta(alpha, x) = sum over k >= 0 of (x + k)^-alpha.
+
+    **Parameters**
+
+        alpha : Float or numpy array of exponents. Should be greater than 1.
+
+        values : Float or numpy array of offsets. Should be greater than 0. alpha and values are broadcast against each other.
+
+    **Returns**
+
+        numpy array of zeta(alpha, x) values.
+
+    """
+
+    return zeta(np.asarray(alpha, dtype=float), np.asarray(values, dtype=float))
+
+def discrete_log_likelihood(alpha, xmin, log_sum, count):
+    """
+
+    Log-likelihood of a discrete power-law, p(x) = x^-alpha / zeta(alpha, xmin), evaluated from sufficient statistics.
+
+    **Parameters**
+
+        alpha : Float or numpy array of exponents.
+
+        xmin : Float or numpy array, xmin for the distribution.
+
+        log_sum : Float or numpy array, sum of log(x) over the values >= xmin.
+
+        count : Integer or numpy array, number of values >= xmin.
+
+    **Returns**
+
+        numpy array of log-likelihoods.
+
+    """
+
+    return -np.asarray(alpha)*log_sum - count*np.log(hurwitz_zeta(alpha, xmin))
+
+def estimate_discrete_scaling_parameter(xmin, log_sum, count):
+    """
+
+    Exact Method of Maximum Liklihood (MLE) for the discrete power-law, found by numerical maximization of the log-likelihood with the Hurwitz zeta normalizer.
+
+    All the candidates are solved at once: each step of the golden section search is a single vectorized zeta evaluation over every xmin. The log-likelihood is concave in alpha, so the search converges to the global maximum.
+
+    **Parameters**
+
+        xmin : Float or numpy array of xmin values.
+
+        log_sum : Float or numpy array, sum of log(x) over the values >= xmin.
+
+        count : Integer or numpy array, number of values >= xmin.
+
+    **Returns**
+
+        numpy array of Estimated Alpha values, one per xmin.
+
+    """
+
+    xmin = np.asarray(xmin, dtype=float)
+    log_sum = np.asarray(log_sum, dtype=float)
+    count = np.asarray(count, dtype=float)
+
+    # the usual continuous approximation brackets the exact estimate comfortably
+    approximate_alpha = 1.0 + count/(log_sum - count*np.log(xmin - 0.5))
+    lower = np.full(np.shape(approximate_alpha), 1.0 + 1e-6)
+    upper = 1.0 + 3.0*(approximate_alpha - 1.0)
+
+    def objective(alpha):
+        return -discrete_log_likelihood(alpha, xmin, log_sum, count)
+
+    left = upper - _GOLDEN_RATIO*(upper - lower)
+    right = lower + _GOLDEN_RATIO*(upper - lower)
+    objective_left = objective(left)
+    objective_right = objective(right)
+    for i in range(_MLE_ITERATIONS):
+        move_right = objective_left > objective_right
+        lower = np.where(move_right, left, lower)
+        upper = np.where(move_right, upper, right)
+        left_new = upper - _GOLDEN_RATIO*(upper - lower)
+        right_new = lower + _GOLDEN_RATIO*(upper - lower)
+        # one of the two interior points is carried over, only the other is evaluated
+        point = np.where(move_right, right_new, left_new)
+        objective_point = objective(point)
+        (objective_left, objective_right) = (np.where(move_right, objective_right, objective_point), np.where(move_right, objective_point, objective_left))
+        (left, right) = (np.where(move_right, right, left_new), np.where(move_right, right_new, left))
+
+    return (lower + upper)/2.0
+
+def discrete_ccdf(alpha, xmin, values):
+    """
+
+    Complementary cumulative distribution function P(X >= x) of the discrete power-law.
+
+    **Parameters**
+
+        alpha : Float, alpha for the distribution.
+
+        xmin : Float/Integer, xmin for the distribution.
+
+        values : numpy array of values >= xmin.
+
+    **Returns**
+
+        numpy array of P(X >= x).
+
+    """
+
+    return hurwitz_zeta(alpha, values)/hurwitz_zeta(alpha, xmin)
+
+@lru_cache(maxsize = 32)
+def _sampling_table(alpha, xmin):
+    """
+
+    Cumulative probabilities of xmin, xmin+1, ..., xmin+_TABLE_SIZE-1 under the discrete power-law. Memoized, as a bootstrap samples thousands of datasets from the same fitted model.
+
+    """
+
+    values = np.arange(xmin, xmin + _TABLE_SIZE, dtype=float)
+    table = np.cumsum(np.power(values, -alpha))/float(hurwitz_zeta(alpha, xmin))
+    table.flags.writeable = False
+    return table
+
+def _sample_tail(alpha, start, n, rng):
+    """
+
+    Exact rejection sampler for the discrete power-law restricted to x >= start.
+
+    Proposals are floor(t) for t drawn from the continuous power-law above start. The ratio of target to proposal probability for value k is bounded by (1+1/k)^alpha, so for a large start almost every proposal is accepted.
+
+    Proposals which do not fit in int64 are rejected, ie values are drawn from the distribution restricted to x < 2^63. This only matters for Alpha close to 1.
+
+    """
+
+    result = np.empty(n, dtype=np.int64)
+    bound = (1.0 + 1.0/start)**alpha
+    filled = 0
+    while filled < n:
+        with np.errstate(over="ignore"):
+            t = start * np.power(1.0 - rng.random(n - filled), -1.0/(alpha - 1.0))
+        k = np.floor(t[t < 2.0**63])
+        size = len(k)
+        # integral of t^-alpha over [k, k+1), up to the common factor 1/(alpha-1)
+        proposal = (np.power(k, 1.0 - alpha) - np.power(k + 1.0, 1.0 - alpha))/(alpha - 1.0)
+        accepted = k[rng.random(size) * bound * proposal <= np.power(k, -alpha)]
+        result[filled:filled + len(accepted)] = accepted
+        filled += len(accepted)
+    return result
+
+def discrete_powerlaw_array(Alpha = 2.0, n = 1, xmin = 1, seed = None):
+    """
+
+    Array of numbers taken from the discrete powerlaw distribution p(x) = x^-Alpha / zeta(Alpha, xmin), sampled exactly rather than by rounding a continuous draw.
+
+    Values close to xmin are drawn by inverse transform over a memoized table of cumulative probabilities and values beyond the table by rejection.
+
+    **Parameters**
+
+        Alpha : Float/Integer, Alpha constant for the distribution.
+            Default value is 2.0
+            Alpha value should be greater than 1.0
+
+        n : Integer, number of elements to be generated.
+            Default value is 1
+
+        xmin : Integer, xmin for the distribution. Should be a positive integer.
+            Default value is 1
+
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
+    """
+
+    if(xmin < 1 or int(xmin) != xmin):
+        raise ValueError("xmin should be a positive integer for discrete power-law, got "+str(xmin))
+    xmin = int(xmin)
+    rng = np.random.default_rng(seed)
+    table = _sampling_table(float(Alpha), xmin)
+
+    u = rng.random(n)
+    in_table = u < table[-1]
+    result = np.empty(n, dtype=np.int64)
+    result[in_table] = xmin + np.searchsorted(table, u[in_table], side="right")
+    in_tail = ~in_table
+    result[in_tail] = _sample_tail(float(Alpha), xmin + _TABLE_SIZE, int(np.count_nonzero(in_tail)), rng)
+    return result
@@ -1,8 +1,40 @@
-from math import e, log, pow
-from random import random
-import matplotlib.pyplot as plt
+from math import pow
+import numpy as np
 
-def random_series(n = 1):
+from .prepared import PreparedSeries
+
+_CHUNK_SIZE = 8192
+
+def _chunk_sizes(n, chunk_size = _CHUNK_SIZE):
+    """
+
+    Generator to split a stream of n elements into chunks. If n < 0, chunks are generated endlessly.
+
+    """
+
+    if(n>-1):
+        for start in range(0, n, chunk_size):
+            yield min(chunk_size, n - start)
+    else:
+        while True:
+            yield chunk_size
+
+def random_array(n = 1, seed = None):
+    """
+
+    Array of uniform random numbers in [0, 1).
+
+    **Parameters**
+        n : Integer, number of elements to be generated.
+            Default value is 1
+
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None, in which case fresh entropy is used.
+
+    """
+    return np.random.default_rng(seed).random(n)
+
+def random_series(n = 1, seed = None):
     """
 
     Generator to generate a stream of random numbers.
@@ -12,15 +44,58 @@ def random_series(n = 1):
             Default value is 1
             If n < 0, then unbounded number of elements are generated.
 
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
     """
-    if(n>-1):
-        for i in range(n):
-            yield random()
-    else:
-        while True:
-            yield random()
+    rng = np.random.default_rng(seed)
+    for size in _chunk_sizes(n):
+        for x in random_array(size, seed = rng).tolist():
+            yield x
 
-def exponential_series(Lambda = 1.0, n = 1, xmin = 1.0, discrete = False):
+def _discretize(series, discrete):
+    """
+
+    Round a continuous sample to the nearest integers if discrete is True. The result is an int64 array, or a float64 array of integral values if some of them do not fit in int64 (heavy tails with Alpha close to 1).
+
+    """
+    if discrete:
+        series = np.rint(series)
+        if(len(series) and np.max(np.abs(series)) >= 2.0**63):
+            return series
+        return series.astype(np.int64)
+    return series
+
+def exponential_array(Lambda = 1.0, n = 1, xmin = 1.0, discrete = False, seed = None):
+    """
+
+    Array of numbers taken from exponential distribution, drawn in a single vectorized inverse-transform step.
+
+    **Parameters**
+
+        Lambda : Float/Integer, Lambda constant for the distribution.
+            Default value is 1.0
+
+        n : Integer, number of elements to be generated.
+            Default value is 1
+
+        xmin : Float/Integer, xmin for the distribution.
+            Default value is 1.0
+
+        discrete : Boolean, Whether the distribution is to be discrete or not (continous).
+            Default value is False
+
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
+    """
+
+    if discrete:
+        xmin = xmin - 0.5
+    x = random_array(n, seed = seed)
+    return _discretize(xmin - (1.0/Lambda) * np.log(1.0-x), discrete)
+
+def exponential_series(Lambda = 1.0, n = 1, xmin = 1.0, discrete = False, seed = None):
     """
 
     Generator to generate a stream of numbers taken from exponential distribution.
@@ -40,21 +115,49 @@ def exponential_series(Lambda = 1.0, n = 1, xmin = 1.0, discrete = False):
         discrete : Boolean, Whether the distribution is to be discrete or not (continous).
             Default value is False
 
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
+    """
+
+    rng = np.random.default_rng(seed)
+    for size in _chunk_sizes(n):
+        for x in exponential_array(Lambda = Lambda, n = size, xmin = xmin, discrete = discrete, seed = rng).tolist():
+            yield x
+
+def stretched_exponential_array(Lambda = 1.0, Beta = 1.0, n = 1, xmin = 1.0, discrete = False, seed = None):
+    """
+
+    Array of numbers taken from stretched exponential distribution, drawn in a single vectorized inverse-transform step.
+
+    **Parameters**
+
+        Lambda : Float/Integer, Lambda constant for the distribution.
+            Default value is 1.0
+
+        Beta : Float/Integer, Beta constant for the distribution.
+            Default value is 1.0
+
+        n : Integer, number of elements to be generated.
+            Default value is 1
+
+        xmin : Float/Integer, xmin for the distribution.
+            Default value is 1.0
+
+        discrete : Boolean, Whether the distribution is to be discrete or not (continous).
+            Default value is False
+
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
     """
-    
-    def mapping(x):
-        return xmin - (1.0/Lambda) * log(1-x)
 
     if discrete:
         xmin = xmin - 0.5
-        for x in random_series(n):
-            yield int(round(mapping(x)))
+    x = random_array(n, seed = seed)
+    return _discretize(np.power( pow(xmin, Beta)-(1.0/Lambda)*np.log(1.0-x), 1.0/Beta ), discrete)
 
-    else:
-        for x in random_series(n):
-            yield mapping(x)
-
-def stretched_exponential_series(Lambda = 1.0, Beta = 1.0, n = 1, xmin = 1.0, discrete = False):
+def stretched_exponential_series(Lambda = 1.0, Beta = 1.0, n = 1, xmin = 1.0, discrete = False, seed = None):
     """
 
     Generator to generate a stream of numbers taken from stretched exponential distribution.
@@ -77,20 +180,47 @@ def stretched_exponential_series(Lambda = 1.0, Beta = 1.0, n = 1, xmin = 1.0, di
         discrete : Boolean, Whether the distribution is to be discrete or not (continous).
             Default value is False
 
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
+    """
+
+    rng = np.random.default_rng(seed)
+    for size in _chunk_sizes(n):
+        for x in stretched_exponential_array(Lambda = Lambda, Beta = Beta, n = size, xmin = xmin, discrete = discrete, seed = rng).tolist():
+            yield x
+
+def powerlaw_array(Alpha = 2.0, n = 1, xmin = 1.0, discrete = False, seed = None):
+    """
+
+    Array of numbers taken from powerlaw distribution, drawn in a single vectorized inverse-transform step.
+
+    **Parameters**
+
+        Alpha : Float/Integer, Alpha constant for the distribution.
+            Default value is 2.0
+            Alpha value should be greater than 1.0
+
+        n : Integer, number of elements to be generated.
+            Default value is 1
+
+        xmin : Float/Integer, xmin for the distribution.
+            Default value is 1.0
+
+        discrete : Boolean, Whether the distribution is to be discrete or not (continous).
+            Default value is False
+
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
     """
-    
-    def mapping(x):
-        return pow( pow(xmin, Beta)-(1.0/Lambda)*log(1.0-x), 1.0/Beta )
 
     if discrete:
         xmin = xmin - 0.5
-        for x in random_series(n):
-            yield int(round(mapping(x)))
-    else:
-        for x in random_series(n):
-            yield mapping(x)
+    x = random_array(n, seed = seed)
+    return _discretize(xmin * np.power( (1.0-x), -1.0/(Alpha - 1.0) ), discrete)
 
-def powerlaw_series(Alpha = 2.0, n = 1, xmin = 1.0, discrete = False):
+def powerlaw_series(Alpha = 2.0, n = 1, xmin = 1.0, discrete = False, seed = None):
     """
     
     Generator to generate a stream of numbers taken from powerlaw distribution.
@@ -111,18 +241,75 @@ def powerlaw_series(Alpha = 2.0, n = 1, xmin = 1.0, discrete = False):
         discrete : Boolean, Whether the distribution is to be discrete or not (continous).
             Default value is False
 
+        seed : numpy.random.Generator, or Integer seed for a new generator.
+            Default value is None
+
     """
-    
-    def mapping(x):
-        return xmin * pow( (1.0-x), -1.0/(Alpha - 1.0) )
 
-    if discrete:
-        xmin = xmin - 0.5
-        for x in random_series(n):
-            yield int(round(mapping(x)))
+    rng = np.random.default_rng(seed)
+    for size in _chunk_sizes(n):
+        for x in powerlaw_array(Alpha = Alpha, n = size, xmin = xmin, discrete = discrete, seed = rng).tolist():
+            yield x
+
+def _sorted_array(series, assume_sorted = False):
+    """
+
+    series as a numpy array sorted in increasing order. The input is only sorted if it is not sorted already, which is checked in linear time unless assume_sorted is True.
+
+    """
+
+    series = np.asarray(series)
+    if(assume_sorted or len(series) < 2 or np.all(series[1:] >= series[:-1])):
+        return series
+    return np.sort(series)
+
+def _distinct_counts(sorted_series):
+    """
+
+    Distinct values of a sorted array and the number of occurrences of each, in linear time.
+
+    """
+
+    if(len(sorted_series) == 0):
+        return (sorted_series, np.zeros(0, dtype=np.int64))
+    first = np.flatnonzero(np.concatenate(([True], sorted_series[1:] != sorted_series[:-1])))
+    counts = np.diff(np.append(first, len(sorted_series)))
+    return (sorted_series[first], counts)
+
+def frequency_array(series, pdf = True, ccdf = True, assume_sorted = False):
+    """
+
+    Array version of `frequency_distribution()`: pdf(probability distribution function) or cdf(cummulative distribution function) or ccdf(complementary cummulative distribution function) of any series.
+
+    **Parameters**
+
+        series : list or numpy array of values, or `powerlaw.prepared.PreparedSeries`.
+
+        pdf : Boolean. If True, return pdf else cdf
+            Default value is True
+
+        ccdf : Boolean. This is considered only if pdf is set to False. If ccdf = True, return ccdf else cdf
+            Default value is True
+
+        assume_sorted : Boolean. If True, series is taken to be sorted in increasing order already (eg a precomputed sorted view), and is not checked or sorted again. Otherwise, it is sorted only if needed.
+            Default value is False
+
+    **Returns**
+
+        Tuple of numpy arrays (values, probabilities), where values are the distinct entries of the input series in increasing order and probabilities are the corresponding pdf, cdf (P(X <= x)) or ccdf (P(X >= x)).
+
+    """
+
+    if(isinstance(series, PreparedSeries)):
+        (values, counts) = (series.distinct_values, series.counts)
     else:
-        for x in random_series(n):
-            yield mapping(x)
+        (values, counts) = _distinct_counts(_sorted_array(series, assume_sorted = assume_sorted))
+    n = float(np.sum(counts))
+    if(pdf):
+        return (values, counts/n)
+    if(ccdf):
+        return (values, np.cumsum(counts[::-1])[::-1]/n)
+    return (values, np.cumsum(counts)/n)
 
 def frequency_distribution(series, pdf = True, ccdf = True):
     """
@@ -131,7 +318,7 @@ def frequency_distribution(series, pdf = True, ccdf = True):
 
     **Parameters**
 
-        series : list of values.
+        series : list of values, or `powerlaw.prepared.PreparedSeries` (eg a histogram).
 
         pdf : Boolean. If True, return pdf else cdf
             Default value is True
@@ -143,47 +330,75 @@ def frequency_distribution(series, pdf = True, ccdf = True):
         
         (key, value) pairs are returned where key is one of the entries from the input series and value is the corresponding pdf for the key. 
         The pairs are sorted by key.
+        Values are counts (not normalised); see `frequency_array()` for probabilities as numpy arrays.
 
     """
 
-    sorted_series = sorted(series)
-    key_to_return = -1
-
-    if(pdf==True or ccdf==False):
-        
-        if(pdf==True):
-            def update_value (value):
-                return 1
-        else:
-            def update_value (value):
-                return value+1
-        
-        value_to_return = 0
-        for key in sorted_series:
-        # print key
-            if(key>key_to_return and key_to_return!=-1):
-                yield (key_to_return, value_to_return)
-                key_to_return = key
-                value_to_return = update_value(value_to_return)
-            else:
-                key_to_return = key
-                value_to_return+=1
-        yield (key_to_return, value_to_return)
+    if(isinstance(series, PreparedSeries)):
+        (keys, counts) = (series.distinct_values, series.counts)
+    else:
+        (keys, counts) = _distinct_counts(_sorted_array(series))
 
+    if(pdf==True):
+        values = counts
+    elif(ccdf==False):
+        values = np.cumsum(counts)
     else:
-        count = len(sorted_series)
-        # print sorted_series
-        value_to_deduct = 0
-        for key in sorted_series:
-            if(key>key_to_return and key_to_return!=-1):
-                yield (key_to_return, count)
-                count -=value_to_deduct
-                key_to_return = key
-                value_to_deduct = 1
-            else:
-                key_to_return = key
-                value_to_deduct+=1
-        yield (key_to_return, count)
+        values = np.cumsum(counts[::-1])[::-1]
+
+    for (key, value) in zip(keys.tolist(), values.tolist()):
+        yield (key, value)
+
+def log_binned_histogram(series, bins_per_decade = 10, chunk_size = 2**22):
+    """
+
+    Compact log-binned form of a (possibly huge or memory-mapped) series, computed in a single pass over it, chunk_size values at a time.
+
+    Every bin is represented by the smallest value that fell in it, and the sum of log(x) over its values is kept as in `powerlaw.streaming.StreamingFit`, so the number of values >= each representative and the sum of their log(x) are exact. The result can be fitted with `prepare_histogram(*log_binned_histogram(series))` (see `powerlaw.prepared.prepare_histogram()`): xmin is then found at the resolution of the bins, Alpha is the MLE for that xmin and the KS statistics are evaluated at the bin representatives only. min_size_series then counts bins, so it should be lowered accordingly, eg to bins_per_decade.
+
+    **Parameters**
+
+        series : list, numpy array (including numpy.memmap) or any iterable of values. Non-positive values are left out.
+
+        bins_per_decade : Integer, number of logarithmic bins per decade. Default value is 10
+
+        chunk_size : Number of values processed at a time. Default value is 2**22
+
+    **Returns**
+
+        Tuple of numpy arrays (smallest value of every non-empty bin in increasing order, number of values in each bin, sum of log(x) over the values of each bin).
+
+    """
+
+    if(not hasattr(series, "__len__")):
+        series = np.fromiter(series, dtype=float)
+    bins = np.zeros(0, dtype=np.int64)
+    minima = None
+    counts = np.zeros(0, dtype=np.int64)
+    log_sums = np.zeros(0)
+    for start in range(0, len(series), chunk_size):
+        chunk = np.sort(np.asarray(series[start:start + chunk_size]))
+        chunk = chunk[chunk > 0]
+        if(len(chunk) == 0):
+            continue
+        # the chunk is sorted, so the first value of every bin is its smallest one
+        index = np.floor(np.log10(chunk, dtype=float)*bins_per_decade).astype(np.int64)
+        first = np.flatnonzero(np.concatenate(([True], index[1:] != index[:-1])))
+        (chunk_bins, chunk_minima, chunk_counts) = (index[first], chunk[first], np.diff(np.append(first, len(chunk))))
+        chunk_log_sums = np.add.reduceat(np.log(chunk, dtype=float), first)
+        if(minima is None):
+            (bins, minima, counts, log_sums) = (chunk_bins, chunk_minima, chunk_counts, chunk_log_sums)
+            continue
+        (merged_bins, inverse) = np.unique(np.concatenate((bins, chunk_bins)), return_inverse=True)
+        merged_counts = np.zeros(len(merged_bins), dtype=np.int64)
+        np.add.at(merged_counts, inverse, np.concatenate((counts, chunk_counts)))
+        log_sums = np.bincount(inverse, weights=np.concatenate((log_sums, chunk_log_sums)), minlength=len(merged_bins))
+        merged_minima = np.full(len(merged_bins), np.inf).astype(np.result_type(minima, chunk_minima, np.float64))
+        np.minimum.at(merged_minima, inverse, np.concatenate((minima, chunk_minima)))
+        (bins, minima, counts) = (merged_bins, merged_minima.astype(np.result_type(minima, chunk_minima)), merged_counts)
+    if(minima is None):
+        minima = np.zeros(0)
+    return (minima, counts, log_sums)
 
 def plot_pdf_series(series):
     """
@@ -197,11 +412,14 @@ def plot_pdf_series(series):
         Log log plot of the values.
 
     """
+    # matplotlib is only needed for plotting, so it is not imported with the module
+    import matplotlib.pyplot as plt
+
     # sorted_series = sorted(series)
     x = []
     y = []
 
-    for (key, value) in pdf(series):
+    for (key, value) in frequency_distribution(series):
         x.append(key)
         y.append(value)
     plt.loglog(x, y,'go', label="original data")
@@ -0,0 +1,108 @@
+import numpy as np
+
+from .regression import _estimate_sorted
+
+import os
+
+# number of elements read from disk at a time, 32 MiB of float64
+_CHUNK_SIZE = 2**22
+# number of elements sampled to estimate a quantile
+_SAMPLE_SIZE = 2**20
+
+def open_series(source, dtype = np.float64, offset = 0):
+    """
+
+    Open a series without reading it into memory.
+
+    **Parameters**
+
+        source : path (string or os.PathLike, eg pathlib.Path) of a .npy file, which is memory-mapped, or of a flat binary file of values of type dtype (eg a dump of float64 or int64), which is memory-mapped as well. numpy arrays (including numpy.memmap) are returned as they are and anything else is converted with numpy.asarray.
+
+        dtype : numpy dtype of the values of a flat binary file. Default value is numpy.float64
+
+        offset : Number of bytes to skip at the start of a flat binary file. Default value is 0
+
+    **Returns**
+
+        numpy array or numpy.memmap.
+
+    """
+
+    if isinstance(source, np.ndarray):
+        return source
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    if isinstance(source, str):
+        if source.endswith(".npy"):
+            return np.load(source, mmap_mode="r")
+        return np.memmap(source, dtype=dtype, mode="r", offset=offset)
+    return np.asarray(source)
+
+def iter_chunks(series, chunk_size = _CHUNK_SIZE):
+    """
+
+    Generator to read a (memory-mapped) series chunk by chunk, so that only chunk_size values are in memory at a time.
+
+    """
+
+    for start in range(0, len(series), chunk_size):
+        yield np.asarray(series[start:start + chunk_size])
+
+def quantile_threshold(series, quantile, sample_size = _SAMPLE_SIZE):
+    """
+
+    Approximate quantile of a (memory-mapped) series, computed on an evenly strided sample of about sample_size values.
+
+    """
+
+    step = max(len(series)//sample_size, 1)
+    return np.quantile(np.asarray(series[::step]), quantile)
+
+def extract_tail(series, threshold, chunk_size = _CHUNK_SIZE):
+    """
+
+    Values of a (memory-mapped) series which are >= threshold, read chunk by chunk.
+
+    **Returns**
+
+        numpy array of the values >= threshold, in the order they appear in the series.
+
+    """
+
+    return np.concatenate([chunk[chunk >= threshold] for chunk in iter_chunks(series, chunk_size)] or [np.zeros(0, dtype=series.dtype)])
+
+def estimate_parameters_out_of_core(source, quantile = 0.9, threshold = None, min_size_series = 50, discrete = False, dtype = np.float64, chunk_size = _CHUNK_SIZE):
+    """
+
+    `powerlaw.regression.estimate_parameters()` for series larger than memory, eg memory-mapped arrays or .npy and flat binary files.
+
+    Only the values above a threshold are read into memory (chunk by chunk) and sorted, and xmin is searched for among them. The KS statistics for a given xmin only depends on the values >= xmin, so the result is the same as the one of `powerlaw.regression.estimate_parameters()` with xmin restricted to be >= threshold.
+
+    **Parameters**
+
+        source : series, numpy.memmap or path of a file. See `open_series()`.
+
+        quantile : Float, quantile of the series used as threshold when threshold is not given. Default value is 0.9, ie only the top 10% of the values are loaded.
+
+        threshold : Float/Integer, smallest value considered as xmin. Default value is None
+
+        min_size_series : See `powerlaw.regression.estimate_parameters()`. Default value is 50.
+
+        discrete : Boolean, whether to treat series as discrete or continous. Default value is False
+
+        dtype : See `open_series()`.
+
+        chunk_size : Number of values read from disk at a time.
+
+    **Returns**
+
+        Tuple of (Estimated xmin, Estimated Alpha value, minimum KS statistics score).
+
+    """
+
+    series = open_series(source, dtype = dtype)
+    if threshold is None:
+        threshold = quantile_threshold(series, quantile)
+    tail = extract_tail(series, threshold, chunk_size = chunk_size)
+    tail.sort()
+    return _estimate_sorted(tail, min_size_series = min_size_series, discrete = discrete)
@@ -0,0 +1,124 @@
+from time import perf_counter
+
+class Instrumentation(object):
+    """
+
+    Interface through which `powerlaw.regression.estimate_parameters()`, `powerlaw.regression.goodness_of_fit()` and `powerlaw.regression.sequential_goodness_of_fit()` report their progress. Every method is a no-op here; subclass and override the ones of interest, or use `Metrics`.
+
+    Instrumentation is off when None is passed (the default), in which case no clock is read and no method is called.
+
+    Phases are "sorting", "prepare" (distinct values, logs and cumulative sums of the sorted series), "mle" and "ks" for the xmin scan and "sampling" for the generation of synthetic datasets. Timings of the bootstrap workers are reported back to the calling process chunk by chunk, but their candidates_scanned() calls are not: candidates are only reported for direct calls of `powerlaw.regression.estimate_parameters()`, `powerlaw.regression.search_xmin()` and `powerlaw.regression.ks_profile()`.
+
+    """
+
+    def phase_finished(self, phase, seconds):
+        """
+
+        Called when seconds more have been spent in phase.
+
+        """
+
+    def candidates_scanned(self, count, total):
+        """
+
+        Called during the xmin scan, count of the total xmin candidates being done.
+
+        """
+
+    def bootstrap_started(self, number_of_datasets):
+        """
+
+        Called before the first synthetic dataset of a goodness of fit test is drawn.
+
+        """
+
+    def datasets_completed(self, completed, total, exceedances):
+        """
+
+        Called during goodness of fit test, completed of the total synthetic datasets being fitted so far, exceedances of them with a KS statistics greater than the one of the data.
+
+        """
+
+class Metrics(Instrumentation):
+    """
+
+    `Instrumentation` which keeps the latest figures, eg to be exported to a job monitoring system with `as_dict()`.
+
+    **Parameters**
+
+        callback : function called with the Metrics object after every progress report of the bootstrap. Default value is None
+
+    """
+
+    def __init__(self, callback = None):
+        self.callback = callback
+        self.phase_seconds = {}
+        self.candidates = 0
+        self.total_candidates = 0
+        self.datasets = 0
+        self.total_datasets = 0
+        self.exceedances = 0
+        self.start = None
+
+    def phase_finished(self, phase, seconds):
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    def candidates_scanned(self, count, total):
+        self.candidates = count
+        self.total_candidates = total
+
+    def bootstrap_started(self, number_of_datasets):
+        self.start = perf_counter()
+        self.datasets = 0
+        self.total_datasets = number_of_datasets
+        self.exceedances = 0
+
+    def datasets_completed(self, completed, total, exceedances):
+        self.datasets = completed
+        self.total_datasets = total
+        self.exceedances = exceedances
+        if self.callback is not None:
+            self.callback(self)
+
+    @property
+    def p_value(self):
+        """
+
+        Running p-value of the bootstrap, None before the first dataset is done.
+
+        """
+
+        if self.datasets == 0:
+            return None
+        return float(self.exceedances)/self.datasets
+
+    @property
+    def eta(self):
+        """
+
+        Estimated number of seconds left in the bootstrap, None before the first dataset is done.
+
+        """
+
+        if self.datasets == 0 or self.start is None:
+            return None
+        elapsed = perf_counter() - self.start
+        return elapsed/self.datasets*(self.total_datasets - self.datasets)
+
+    def as_dict(self):
+        """
+
+        Snapshot of all the figures as a dict.
+
+        """
+
+        return {
+            "candidates": self.candidates,
+            "total_candidates": self.total_candidates,
+            "datasets": self.datasets,
+            "total_datasets": self.total_datasets,
+            "exceedances": self.exceedances,
+            "p_value": self.p_value,
+            "eta": self.eta,
+            "phase_seconds": dict(self.phase_seconds),
+        }
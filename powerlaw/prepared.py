@@ -0,0 +1,188 @@
+import numpy as np
+
+class PreparedSeries(object):
+    """
+
+    A series sorted and summarized once, to be passed in place of the raw series to `powerlaw.regression.estimate_parameters()`, `powerlaw.regression.search_xmin()`, `powerlaw.regression.goodness_of_fit()`, `powerlaw.regression.sequential_goodness_of_fit()`, `powerlaw.regression.bootstrap()`, `powerlaw.regression.generate_dataset()`, `powerlaw.distribution.frequency_array()` and `powerlaw.distribution.frequency_distribution()`, so that multi-step analyses of the same data only pay for the sort and the cumulative sums once. Use `prepare_series()` to build one.
+
+    It can also be built from a histogram, ie distinct values and their number of occurrences, with `prepare_histogram()`. The samples are then never expanded: fitting costs time and memory in the number of distinct values, not in the number of samples. Note that min_size_series then counts distinct values, eg bins for a log-binned histogram.
+
+    The arrays are shared by every function the object is passed to and should not be modified.
+
+    **Attributes**
+
+        sorted_series : numpy array of the values, sorted in increasing order, or None if built from a histogram.
+
+        distinct_values : numpy array of the distinct values, in increasing order.
+
+        counts : numpy array of the number of occurrences of each distinct value.
+
+        count_ge : numpy array of the number of values >= each distinct value, ie the unnormalised empirical ccdf.
+
+        log_distinct_values : numpy array of log(distinct values).
+
+        log_sum_ge : numpy array of the sum of log(x) over the values >= each distinct value.
+
+    **Parameters**
+
+        sorted_series : numpy array of values, sorted in increasing order. If counts is given, numpy array of distinct values in increasing order instead.
+
+        buffers : Tuple of (boolean numpy array, float numpy array, float numpy array), each at least as long as sorted_series, used as scratch space instead of allocating temporary arrays of the size of the series, eg when many series of the same size are prepared in turn. They are free for reuse once the object is built. Default value is None
+
+        counts : numpy array of positive integers, number of occurrences of every value of sorted_series. Default value is None
+
+        log_sums : numpy array of the sum of log(x) over the samples counted by every entry of counts, eg when every value stands for a bin of samples. Default value is None, ie counts*log(value).
+
+    """
+
+    def __init__(self, sorted_series, buffers = None, counts = None, log_sums = None):
+        if(counts is not None):
+            self.sorted_series = None
+            self.distinct_values = sorted_series
+            self.count_ge = np.cumsum(counts[::-1])[::-1]
+            # 0 and negative values give -inf and NaN logs, they are never xmin candidates
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.log_distinct_values = np.log(sorted_series, dtype=float)
+            if(log_sums is None):
+                log_sums = counts*self.log_distinct_values
+            self.log_sum_ge = np.cumsum(log_sums[::-1])[::-1]
+            self.size = int(self.count_ge[0]) if len(counts) else 0
+            return
+
+        self.sorted_series = sorted_series
+        self.size = n = len(sorted_series)
+        if(n == 0):
+            self.distinct_values = sorted_series[:0]
+            self.count_ge = np.zeros(0, dtype=np.int64)
+            self.log_distinct_values = np.empty(0)
+            self.log_sum_ge = np.empty(0)
+            return
+
+        if(buffers is None):
+            buffers = (np.empty(n, dtype=bool), np.empty(n), np.empty(n))
+        (is_first, log_values, suffix_log_sum) = (buffer[:n] for buffer in buffers)
+
+        # index of the first occurrence of every distinct value
+        is_first[0] = True
+        np.not_equal(sorted_series[1:], sorted_series[:-1], out=is_first[1:])
+        first = np.flatnonzero(is_first)
+        # 0 and negative values give -inf and NaN logs, they are never xmin candidates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log(sorted_series, out=log_values, dtype=float)
+        np.cumsum(log_values[::-1], out=suffix_log_sum[::-1])
+
+        self.distinct_values = sorted_series[first]
+        self.count_ge = n - first
+        self.log_distinct_values = log_values[first]
+        self.log_sum_ge = suffix_log_sum[first]
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def counts(self):
+        # derived from count_ge on demand, as the xmin scan does not need it
+        return self.count_ge - np.append(self.count_ge[1:], 0)
+
+    def candidate_range(self, min_size_series = 50):
+        """
+
+        First and one past the last index (into distinct_values) of the xmin candidates: the last min_size_series-1 distinct values (and at least the largest one) are never tried as xmin, nor are non-positive values, for which log(x/xmin) is undefined.
+
+        """
+
+        stop = max(len(self.distinct_values) - max(min_size_series - 1, 1), 0)
+        start = int(np.searchsorted(self.distinct_values[:stop], 0, side="right"))
+        return (start, stop)
+
+    def _check_samples(self):
+        if(self.sorted_series is None):
+            raise ValueError("PreparedSeries built from a histogram has no samples, use distinct_values and counts instead")
+
+    def below(self, xmin):
+        """
+
+        Sorted values < xmin, as a view of sorted_series.
+
+        """
+
+        self._check_samples()
+        return self.sorted_series[:int(np.searchsorted(self.sorted_series, xmin, side="left"))]
+
+    def tail(self, xmin):
+        """
+
+        Sorted values >= xmin, as a view of sorted_series.
+
+        """
+
+        self._check_samples()
+        return self.sorted_series[int(np.searchsorted(self.sorted_series, xmin, side="left")):]
+
+def prepare_series(series, assume_sorted = False):
+    """
+
+    Sort and summarize a series once for repeated analyses, see `PreparedSeries`.
+
+    **Parameters**
+
+        series : list or numpy array of values (including numpy.memmap). A PreparedSeries is returned as it is.
+
+        assume_sorted : Boolean. If True, series is taken to be sorted in increasing order already and is not copied. Default value is False
+
+    **Returns**
+
+        PreparedSeries.
+
+    """
+
+    if(isinstance(series, PreparedSeries)):
+        return series
+    series = np.asarray(series)
+    if(not assume_sorted):
+        series = np.sort(series)
+    return PreparedSeries(series)
+
+def prepare_histogram(values, counts, log_sums = None):
+    """
+
+    Summarize a histogram, eg (degree, number of nodes) pairs aggregated upstream, for the fitting functions, see `PreparedSeries`. The result is the same as the one of `prepare_series()` on the series where every value is repeated count times (up to rounding in the sums of log(x)), without ever building that series.
+
+    With log_sums, every value stands for a bin of samples >= it, eg the output of `powerlaw.distribution.log_binned_histogram()`: Alpha is then the exact MLE for xmin at the bin values, and the KS statistics are evaluated at the bin values only.
+
+    **Parameters**
+
+        values : list or numpy array of values, in any order. Repeated values are merged.
+
+        counts : list or numpy array of non-negative integers, number of occurrences of every value. Values with a count of 0 are dropped.
+
+        log_sums : list or numpy array of the sum of log(x) over the samples of every value (bin). Default value is None, ie count*log(value).
+
+    **Returns**
+
+        PreparedSeries.
+
+    """
+
+    values = np.asarray(values)
+    counts = np.asarray(counts, dtype=np.int64)
+    if(values.shape != counts.shape):
+        raise ValueError("values and counts should have the same length, got "+str(len(values))+" and "+str(len(counts)))
+    if(np.any(counts < 0)):
+        raise ValueError("counts should be non-negative")
+    if(log_sums is not None):
+        log_sums = np.asarray(log_sums, dtype=float)
+        if(log_sums.shape != counts.shape):
+            raise ValueError("log_sums and counts should have the same length, got "+str(len(log_sums))+" and "+str(len(counts)))
+
+    keep = counts > 0
+    order = np.argsort(values[keep], kind="stable")
+    (values, counts) = (values[keep][order], counts[keep][order])
+    if(log_sums is not None):
+        log_sums = log_sums[keep][order]
+    if(len(values)):
+        first = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+        (values, counts) = (values[first], np.add.reduceat(counts, first))
+        if(log_sums is not None):
+            log_sums = np.add.reduceat(log_sums, first)
+    return PreparedSeries(values, counts = counts, log_sums = log_sums)
@@ -1,41 +1,198 @@
 import numpy as np
-from sklearn import linear_model
-import matplotlib.pyplot as plt
-from scipy.special import zeta
+from scipy.special import betaincinv
 
-from .distribution import frequency_distribution, powerlaw_series, random_series
-from .utils import unique
+from .backends import get_scan, resolve_backend
+from .checkpoint import load_checkpoint, save_checkpoint
+from .discrete import discrete_ccdf, discrete_powerlaw_array, estimate_discrete_scaling_parameter
+from .distribution import powerlaw_array, powerlaw_series
+from .instrumentation import Metrics
+from .prepared import PreparedSeries, prepare_series
 
-from math import pow, e, log, sqrt
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from math import pow, e, log, sqrt, ceil
+import os
 import sys
-import random
+from time import perf_counter
+import tracemalloc
 
+# number of xmin candidates between two progress reports of the scan
+_PROGRESS_EVERY = 1024
+# number of values of the tails of a block of xmin candidates evaluated at once by the KS profile
+_BLOCK_ELEMENTS = 2**14
 
-def least_square_regression(x, y, xlabel = "x", ylabel = "y", prefix="", suffix=""):
+
+RegressionResult = namedtuple("RegressionResult", ["slope", "intercept", "r_squared", "residuals"])
+
+def batch_linear_regression(xs, ys, weights = None):
     """
 
-    Perform least square regression to find the best fit line and returns the slope of the line.
+    Closed-form (weighted) least square regression of many independent series at once. All the series are concatenated and the sums needed for the normal equations are taken segment by segment, so there is no Python-level work per point.
+
+    **Parameters**
+
+        xs : List of sequences of values along x axis, one per series.
+
+        ys : List of sequences of values along y axis, one per series.
+
+        weights : List of sequences of weights, one per series. Default value is None, ie every point has weight 1.
+
+    **Returns**
+
+        List of RegressionResult named tuples of (slope, intercept, R^2, numpy array of residuals), one per series. Empty series get NaN slope, intercept and R^2.
+
+    """
+
+    lengths = np.array([len(x) for x in xs])
+    if(len(lengths) == 0):
+        return []
+    x = np.concatenate([np.asarray(x, dtype=float) for x in xs])
+    y = np.concatenate([np.asarray(y, dtype=float) for y in ys])
+    if(weights is None):
+        w = np.ones(len(x))
+    else:
+        w = np.concatenate([np.asarray(weight, dtype=float) for weight in weights])
+
+    # series of every point; bincount gives a sum of 0 for empty series, whose results are then NaN
+    index = np.repeat(np.arange(len(lengths)), lengths)
+    def segment_sum(values):
+        return np.bincount(index, weights=values, minlength=len(lengths))
+
+    sum_w = segment_sum(w)
+    sum_wx = segment_sum(w*x)
+    sum_wy = segment_sum(w*y)
+    sum_wxx = segment_sum(w*x*x)
+    sum_wxy = segment_sum(w*x*y)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (sum_w*sum_wxy - sum_wx*sum_wy)/(sum_w*sum_wxx - sum_wx*sum_wx)
+        intercept = (sum_wy - slope*sum_wx)/sum_w
+
+        residuals = y - (slope[index]*x + intercept[index])
+        mean_y = (sum_wy/sum_w)[index]
+        r_squared = 1.0 - segment_sum(w*residuals*residuals)/segment_sum(w*(y - mean_y)**2)
+
+    residuals = np.split(residuals, np.cumsum(lengths)[:-1])
+    return [RegressionResult(float(slope[i]), float(intercept[i]), float(r_squared[i]), residuals[i]) for i in range(len(lengths))]
+
+def linear_regression(x, y, weights = None):
+    """
+
+    Closed-form (weighted) least square regression, y = slope * x + intercept.
 
     **Parameters**
         x : List of values along x axis.
-        y : List of values along y axis.   
+        y : List of values along y axis.
+        weights : List of weights of the points. Default value is None, ie every point has weight 1.
+
+    **Returns**
+
+        RegressionResult named tuple of (slope, intercept, R^2, numpy array of residuals).
 
     """
 
-    X = np.asarray(x).reshape((len(x), 1))
-    Y = np.asarray(y).reshape((len(y), 1))
-    regr = linear_model.LinearRegression()
-    regr.fit(X, Y)
+    return batch_linear_regression([x], [y], None if weights is None else [weights])[0]
 
-    label_string = "Best fit line, y = "+str(regr.coef_[0][0])+" * x + "+str(regr.intercept_[0])
-    print(label_string)
-    print("Residual sum of squares: %.2f" % np.mean((regr.predict(X) - Y) ** 2))
-    print("Variance score: %.2f" % regr.score(X, Y))
+def _loglog_points(series, ccdf = False, log_binned = False, bins_per_decade = 10):
+    """
+
+    Points (log10(x), log10(p(x))) of the pdf (or ccdf) of a series, along with the number of observations behind every point.
+
+    """
+
+    series = np.asarray(series, dtype=float)
+    series = series[series > 0]
+    n = len(series)
+    if(n == 0):
+        return (series, series, np.zeros(0, dtype=np.int64))
+    if(log_binned and not ccdf):
+        # density of every logarithmic bin, at the geometric centre of the bin
+        low = np.log10(np.min(series))
+        high = np.log10(np.max(series))
+        number_of_bins = max(int(ceil((high - low)*bins_per_decade)), 1)
+        edges = np.logspace(low, high, number_of_bins + 1)
+        (counts, edges) = np.histogram(series, bins=edges)
+        keep = counts > 0
+        x = np.sqrt(edges[:-1]*edges[1:])[keep]
+        y = counts[keep]/(n*np.diff(edges)[keep])
+        return (np.log10(x), np.log10(y), counts[keep])
+
+    (values, counts) = np.unique(series, return_counts=True)
+    if(ccdf):
+        y = np.cumsum(counts[::-1])[::-1]/float(n)
+    else:
+        y = counts/float(n)
+    return (np.log10(values), np.log10(y), counts)
+
+def batch_loglog_regression(series_list, ccdf = False, log_binned = False, bins_per_decade = 10, weighted = False):
+    """
+
+    Fit a line to the pdf (or ccdf) of many series on the log-log scale, without printing or plotting anything. See `loglog_regression()`.
+
+    **Parameters**
+
+        series_list : List of series of data.
+
+        For the other parameters, see `loglog_regression()`.
+
+    **Returns**
+
+        List of RegressionResult named tuples, one per series.
+
+    """
+
+    points = [_loglog_points(series, ccdf = ccdf, log_binned = log_binned, bins_per_decade = bins_per_decade) for series in series_list]
+    weights = [point[2] for point in points] if weighted else None
+    return batch_linear_regression([point[0] for point in points], [point[1] for point in points], weights = weights)
+
+def loglog_regression(series, ccdf = False, log_binned = False, bins_per_decade = 10, weighted = False):
+    """
+
+    Fit a line to the pdf (or ccdf) of a series on the log-log scale, without printing or plotting anything. For a power-law, the slope of the pdf is -Alpha and that of the ccdf is 1-Alpha.
+
+    **Parameters**
+
+        series : series of data. Non-positive values are ignored.
+
+        ccdf : Boolean. If True, fit the ccdf rather than the pdf. Default value is False
+
+        log_binned : Boolean. If True, the pdf is estimated over logarithmic bins, which reduces the fluctuations in the tail. Ignored for the ccdf. Default value is False
+
+        bins_per_decade : Integer, number of logarithmic bins per decade. Default value is 10
+
+        weighted : Boolean. If True, every point is weighted by the number of observations behind it. Default value is False
+
+    **Returns**
+
+        RegressionResult named tuple of (slope, intercept, R^2, numpy array of residuals).
+
+    """
+
+    return batch_loglog_regression([series], ccdf = ccdf, log_binned = log_binned, bins_per_decade = bins_per_decade, weighted = weighted)[0]
+
+def plot_regression(x, y, result, xlabel = "x", ylabel = "y", prefix="", suffix="", show = True):
+    """
+
+    Plot the points and the best fit line found by `linear_regression()` and save the plot to prefix+"least_square_regression_fit"+suffix+".png".
+
+    **Parameters**
+        x : List of values along x axis.
+        y : List of values along y axis.
+        result : RegressionResult for x and y.
+        show : Boolean. If True, also show the plot, which blocks under an interactive backend. Default value is True
+
+    """
+
+    # matplotlib is slow to import and not needed by the fitting code, so it is only loaded here
+    import matplotlib.pyplot as plt
+
+    X = np.asarray(x, dtype=float)
+    Y = np.asarray(y, dtype=float)
+    label_string = "Best fit line, y = "+str(result.slope)+" * x + "+str(result.intercept)
 
     # Plot outputs
     original_data, = plt.plot(X, Y,'go', label="original data")
-    # best_fit_line, = plt.plot(X, map(lambda x: pow(e, -x), X), 'bo', label=label_string)
-    best_fit_line, = plt.plot(X, regr.predict(X), color='blue', linewidth=3, label=label_string)
+    best_fit_line, = plt.plot(X, result.slope*X + result.intercept, color='blue', linewidth=3, label=label_string)
     plt.title("Least Square Regression"+suffix)
     plt.ylabel(ylabel)
     plt.xlabel(xlabel)
@@ -45,8 +202,29 @@ def least_square_regression(x, y, xlabel = "x", ylabel = "y", prefix="", suffix=
 
     plt.legend(curves, labels)
     plt.savefig(prefix+"least_square_regression_fit"+suffix+".png")
-    plt.show()
-    return regr.coef_[0][0]
+    if(show):
+        plt.show()
+
+def least_square_regression(x, y, xlabel = "x", ylabel = "y", prefix="", suffix=""):
+    """
+
+    Perform least square regression to find the best fit line and returns the slope of the line. The fit is printed, plotted and saved; use `linear_regression()` for the computation alone.
+
+    **Parameters**
+        x : List of values along x axis.
+        y : List of values along y axis.   
+
+    """
+
+    result = linear_regression(x, y)
+
+    label_string = "Best fit line, y = "+str(result.slope)+" * x + "+str(result.intercept)
+    print(label_string)
+    print("Residual sum of squares: %.2f" % np.mean(result.residuals ** 2))
+    print("Variance score: %.2f" % result.r_squared)
+
+    plot_regression(x, y, result, xlabel = xlabel, ylabel = ylabel, prefix = prefix, suffix = suffix)
+    return result.slope
 
 def estimate_scaling_parameter(series, xmin = 1, discrete = False):
     
@@ -78,55 +256,506 @@ def estimate_scaling_parameter(series, xmin = 1, discrete = False):
     Alpha = 1.0 + count*(1/partial_sum) 
     return Alpha
 
-def estimate_parameters(series, min_size_series = 50, discrete = False):
+_ScanState = namedtuple("_ScanState", ["distinct_values", "log_distinct_values", "count_ge", "log_sum_ge", "start", "stop"])
+
+def _scan_state(sorted_series, min_size_series = 50, instrumentation = None, buffers = None):
+    """
+
+    Everything the xmin scan needs from a sorted series (or a `powerlaw.prepared.PreparedSeries`, in which case nothing is recomputed). buffers are the scratch arrays of `powerlaw.prepared.PreparedSeries`.
+
+    **Returns**
+
+        _ScanState named tuple of (distinct values, their logs, number of values >= each distinct value, sum of log(x) over the values >= each distinct value, index of the first and one past the last distinct value which is a xmin candidate).
+
+    """
+
+    if(isinstance(sorted_series, PreparedSeries)):
+        prepared = sorted_series
+    else:
+        if(instrumentation is not None):
+            clock = perf_counter()
+        prepared = PreparedSeries(sorted_series, buffers = buffers)
+        if(instrumentation is not None):
+            instrumentation.phase_finished("prepare", perf_counter() - clock)
+
+    (start, stop) = prepared.candidate_range(min_size_series)
+    return _ScanState(prepared.distinct_values, prepared.log_distinct_values, prepared.count_ge, prepared.log_sum_ge, start, stop)
+
+def _ks_single(state, index, alpha, buffers = None):
+    """
+
+    KS statistics of the continuous power-law fitted for the xmin candidate state.distinct_values[index], written into the two float arrays of buffers (see `powerlaw.prepared.PreparedSeries`) if given.
+
+    """
+
+    count_ge = state.count_ge
+    log_values = state.log_distinct_values
+    if(buffers is None):
+        Sx = count_ge[index:]/float(count_ge[index])
+        Px = np.exp((1.0 - alpha)*(log_values[index:] - log_values[index]))
+        return np.max(np.abs(Sx - Px))
+    size = len(count_ge) - index
+    (Sx, Px) = (buffers[1][:size], buffers[2][:size])
+    np.divide(count_ge[index:], float(count_ge[index]), out=Sx)
+    np.subtract(log_values[index:], log_values[index], out=Px)
+    np.multiply(Px, 1.0 - alpha, out=Px)
+    np.exp(Px, out=Px)
+    np.subtract(Sx, Px, out=Sx)
+    return max(np.max(Sx), -np.min(Sx))
+
+def _ks_block(state, block, alphas):
+    """
+
+    KS statistics of the continuous power-laws fitted for the xmin candidates state.distinct_values[block] (increasing indices), evaluated together as 2-d arrays over the tail of the smallest candidate: the empirical CCDF of the tail of every candidate is count_ge rescaled by its tail size and the model CCDF is (x/xmin)^(1-Alpha).
+
+    """
+
+    first = block[0]
+    count_ge = state.count_ge[first:]
+    log_values = state.log_distinct_values[first:]
+    # the values below a candidate are not part of its tail; its own xmin gives a distance of 0 anyway
+    below = np.arange(len(count_ge)) < (block - first)[:, None]
+    distance = count_ge/state.count_ge[block, None].astype(float)
+    Px = np.subtract(log_values, state.log_distinct_values[block, None])
+    # log(x/xmin) < 0 below xmin, where (x/xmin)^(1-Alpha) could overflow: masked before exp
+    Px[below] = 0.0
+    np.multiply(Px, (1.0 - alphas)[:, None], out=Px)
+    np.exp(Px, out=Px)
+    np.subtract(distance, Px, out=distance)
+    np.abs(distance, out=distance)
+    distance[below] = 0.0
+    return np.max(distance, axis=1)
+
+def _ks_profile(state, indices, alphas, instrumentation = None, buffers = None):
+    """
+
+    KS statistics of the continuous power-laws fitted for the xmin candidates state.distinct_values[indices] (increasing indices).
+
+    Candidates are walked from the largest to the smallest. The tail of a candidate is a suffix of the tail of the next smaller one, so candidates are grouped in blocks whose tails add up to at most _BLOCK_ELEMENTS values and every block is evaluated at once by `_ks_block()`. Most candidates have short tails, so this saves a round of numpy calls per candidate; candidates with a tail longer than _BLOCK_ELEMENTS are evaluated one at a time by `_ks_single()`. The results are the same as evaluating every candidate on its own.
+
+    """
+
+    ks_statistics = np.empty(len(indices))
+    size = len(state.count_ge)
+    tail_sizes = size - indices
+    if(buffers is None and len(indices)):
+        # scratch arrays for the candidates evaluated one at a time, rather than new arrays for every one of them
+        buffers = (None, np.empty(tail_sizes[0]), np.empty(tail_sizes[0]))
+    stop = len(indices)
+    reported = 0
+    while(stop > 0):
+        start = stop - 1
+        while(start > 0 and (stop - start + 1)*tail_sizes[start - 1] <= _BLOCK_ELEMENTS):
+            start -= 1
+        if(stop - start == 1):
+            ks_statistics[start] = _ks_single(state, int(indices[start]), alphas[start], buffers = buffers)
+        else:
+            ks_statistics[start:stop] = _ks_block(state, indices[start:stop], alphas[start:stop])
+        stop = start
+        if(instrumentation is not None and len(indices) - stop - reported >= _PROGRESS_EVERY):
+            reported = len(indices) - stop
+            instrumentation.candidates_scanned(reported, len(indices))
+    return ks_statistics
+
+def _fit_candidates(state, indices, discrete = False, instrumentation = None, buffers = None, backend = None):
+    """
+
+    Fit a power-law for the xmin candidates state.distinct_values[indices], indices being increasing.
+
+    The MLE for every candidate is read off suffix cumulative sums of log(x) (for discrete data, the exact MLE is solved for all candidates at once, see `estimate_discrete_scaling_parameter()`). For continuous data, the KS statistics come from `_ks_profile()`, unless backend has a scan of its own (see `powerlaw.backends`) which then gives both the MLE and the KS statistics; for discrete data, the empirical and model CCDFs are evaluated as array operations over the distinct values of the tail of every candidate.
+
+    **Returns**
+
+        Tuple of numpy arrays (Estimated Alpha values, KS statistics scores), one entry per candidate.
+
+    """
+
+    scan = None if discrete else get_scan(backend)
+    if(scan is not None):
+        if(instrumentation is not None):
+            clock = perf_counter()
+        (alphas, ks_statistics) = scan(state.log_distinct_values, state.count_ge, state.log_sum_ge, indices)
+        if(instrumentation is not None):
+            instrumentation.phase_finished("ks", perf_counter() - clock)
+            instrumentation.candidates_scanned(len(indices), len(indices))
+        return (alphas, ks_statistics)
+
+    if(instrumentation is not None):
+        clock = perf_counter()
+
+    candidates = state.distinct_values[indices]
+    tail_size = state.count_ge[indices]
+    log_sum = state.log_sum_ge[indices]
+    if(discrete):
+        alphas = estimate_discrete_scaling_parameter(candidates, log_sum, tail_size)
+    else:
+        alphas = 1.0 + tail_size/(log_sum - tail_size*state.log_distinct_values[indices])
+
+    if(instrumentation is not None):
+        instrumentation.phase_finished("mle", perf_counter() - clock)
+        clock = perf_counter()
+
+    if(discrete):
+        ks_statistics = np.empty(len(indices))
+        count_ge = state.count_ge
+        for (counter, index) in enumerate(indices.tolist()):
+            Sx = count_ge[index:]/float(count_ge[index])
+            Px = discrete_ccdf(alphas[counter], state.distinct_values[index], state.distinct_values[index:])
+            ks_statistics[counter] = np.max(np.abs(Sx - Px))
+            if(instrumentation is not None and (counter + 1) % _PROGRESS_EVERY == 0):
+                instrumentation.candidates_scanned(counter + 1, len(indices))
+    else:
+        ks_statistics = _ks_profile(state, indices, alphas, instrumentation = instrumentation, buffers = buffers)
+
+    if(instrumentation is not None):
+        instrumentation.phase_finished("ks", perf_counter() - clock)
+        instrumentation.candidates_scanned(len(indices), len(indices))
+
+    return (alphas, ks_statistics)
+
+KSProfile = namedtuple("KSProfile", ["xmin", "alpha", "ks_statistics", "best"])
+
+def ks_profile(series, min_size_series = 50, discrete = False, xmin_range = None, instrumentation = None, backend = None):
+    """
+
+    Fit a power-law for every xmin candidate and return the whole KS profile, eg for diagnostics or to plot the KS statistics against xmin. `estimate_parameters()` picks the candidate with the smallest KS statistics from the same profile.
+
+    **Parameters**
+
+        series : series of data to be fit, or its `powerlaw.prepared.PreparedSeries`.
+
+        min_size_series : See `estimate_parameters()`.
+
+        discrete : Boolean, whether to treat series as discrete or continous. Default value is False
+
+        xmin_range : Tuple of (lowest xmin, highest xmin) to restrict the candidates to, see `search_xmin()`. Default value is None
+
+        instrumentation : See `estimate_parameters()`.
+
+        backend : See `estimate_parameters()`.
+
+    **Returns**
+
+        KSProfile named tuple of (numpy array of xmin candidates in increasing order, numpy array of Estimated Alpha values, numpy array of KS statistics scores, index of the best candidate or None if there is no candidate).
+
+    """
+
+    if(not isinstance(series, PreparedSeries)):
+        series = np.sort(np.asarray(series))
+    state = _scan_state(series, min_size_series = min_size_series, instrumentation = instrumentation)
+    indices = np.arange(*_candidate_range(state, xmin_range))
+    (alphas, ks_statistics) = _fit_candidates(state, indices, discrete = discrete, instrumentation = instrumentation, backend = backend)
+    # argmin picks the first minimum, ie the smallest xmin among ties
+    best = int(np.argmin(ks_statistics)) if len(indices) else None
+    return KSProfile(state.distinct_values[indices], alphas, ks_statistics, best)
+
+def _candidate_range(state, xmin_range = None):
+    """
+
+    First and one past the last index of the xmin candidates within xmin_range = (lowest xmin, highest xmin), either bound being optional.
+
+    """
+
+    (start, stop) = (state.start, state.stop)
+    if(xmin_range is not None):
+        (low, high) = xmin_range
+        if(low is not None):
+            start = max(start, int(np.searchsorted(state.distinct_values, low, side="left")))
+        if(high is not None):
+            stop = min(stop, int(np.searchsorted(state.distinct_values, high, side="right")))
+    return (start, max(start, stop))
+
+def _candidate_grid(state, start, stop, size, spacing):
+    """
+
+    At most size indices of xmin candidates between start and stop (excluded), spread evenly over the quantiles of the data ("quantile") or over log(xmin) ("log").
+
+    """
+
+    if(stop - start <= size):
+        return np.arange(start, stop)
+    if(spacing == "log"):
+        targets = np.linspace(state.log_distinct_values[start], state.log_distinct_values[stop - 1], size)
+        indices = np.searchsorted(state.log_distinct_values[start:stop], targets) + start
+    else:
+        # count_ge is decreasing, ie evenly spaced tail sizes are evenly spaced quantiles
+        targets = np.linspace(state.count_ge[start], state.count_ge[stop - 1], size)
+        indices = np.searchsorted(-state.count_ge[start:stop], -targets) + start
+    return np.unique(np.clip(indices, start, stop - 1))
+
+XminSearch = namedtuple("XminSearch", ["xmin", "alpha", "ks_statistics", "candidates_evaluated"])
+
+_SEARCH_STRATEGIES = ("exhaustive", "quantile", "log", "coarse_to_fine")
+
+def _search_sorted(sorted_series, min_size_series = 50, discrete = False, search = "exhaustive", max_candidates = 200, xmin_range = None, instrumentation = None, buffers = None, backend = None):
+    """
+
+    `search_xmin()` for a numpy array which is sorted already. buffers are scratch arrays of the size of the series, see `powerlaw.prepared.PreparedSeries`.
+
+    """
+
+    if(search not in _SEARCH_STRATEGIES):
+        raise ValueError("search should be one of "+", ".join(_SEARCH_STRATEGIES)+", got "+str(search))
+
+    state = _scan_state(sorted_series, min_size_series = min_size_series, instrumentation = instrumentation, buffers = buffers)
+    (start, stop) = _candidate_range(state, xmin_range)
+
+    if(search == "exhaustive"):
+        indices = np.arange(start, stop)
+    elif(search == "coarse_to_fine"):
+        indices = _candidate_grid(state, start, stop, max_candidates, "log")
+    else:
+        indices = _candidate_grid(state, start, stop, max_candidates, search)
+    (alphas, ks_statistics) = _fit_candidates(state, indices, discrete = discrete, instrumentation = instrumentation, buffers = buffers, backend = backend)
+
+    if(search == "coarse_to_fine"):
+        # zoom in on the neighbourhood of the best candidate of the grid until every candidate in it has been evaluated
+        while(len(indices) and stop - start > len(np.flatnonzero((indices >= start) & (indices < stop)))):
+            grid = indices[(indices >= start) & (indices < stop)]
+            best = int(np.argmin(ks_statistics[np.searchsorted(indices, grid)]))
+            (start, stop) = (int(grid[max(best - 1, 0)]), int(grid[min(best + 1, len(grid) - 1)]) + 1)
+            new_indices = np.setdiff1d(_candidate_grid(state, start, stop, max_candidates, "quantile"), indices)
+            if(len(new_indices) == 0):
+                new_indices = np.setdiff1d(np.arange(start, stop), indices)
+            (new_alphas, new_ks_statistics) = _fit_candidates(state, new_indices, discrete = discrete, instrumentation = instrumentation, buffers = buffers, backend = backend)
+            order = np.argsort(np.concatenate((indices, new_indices)), kind="mergesort")
+            indices = np.concatenate((indices, new_indices))[order]
+            alphas = np.concatenate((alphas, new_alphas))[order]
+            ks_statistics = np.concatenate((ks_statistics, new_ks_statistics))[order]
+
+    if(len(indices) == 0):
+        return XminSearch(0, 2, sys.maxsize, 0)
+
+    # argmin picks the first minimum, ie the smallest xmin among ties
+    best = int(np.argmin(ks_statistics))
+    return XminSearch(state.distinct_values[indices[best]].item(), float(alphas[best]), float(ks_statistics[best]), len(indices))
+
+def search_xmin(series, min_size_series = 50, discrete = False, search = "exhaustive", max_candidates = 200, xmin_range = None, instrumentation = None, backend = None):
+    """
+
+    `estimate_parameters()` with a choice of xmin search strategy, which also reports how many xmin candidates were evaluated.
+
+    **Parameters**
+
+        series : series of data to be fit, or its `powerlaw.prepared.PreparedSeries`.
+
+        min_size_series : See `estimate_parameters()`.
+
+        discrete : Boolean, whether to treat series as discrete or continous. Default value is False
+
+        search : Strategy to pick the xmin candidates to evaluate. Default value is "exhaustive"
+            "exhaustive" : every distinct value (as in the paper).
+            "quantile" : at most max_candidates candidates spread evenly over the quantiles of the data.
+            "log" : at most max_candidates candidates spread evenly over log(xmin).
+            "coarse_to_fine" : a log grid of at most max_candidates candidates, then repeatedly a finer grid between the neighbours of the best candidate so far, until all the candidates there have been evaluated.
+
+        max_candidates : Integer, size of the grids of the "quantile", "log" and "coarse_to_fine" strategies. Default value is 200
+
+        xmin_range : Tuple of (lowest xmin, highest xmin) to restrict the candidates to, either bound may be None. Default value is None
+
+        instrumentation : See `estimate_parameters()`.
+
+        backend : See `estimate_parameters()`.
+
+    **Returns**
+
+        XminSearch named tuple of (Estimated xmin, Estimated Alpha value, minimum KS statistics score, number of xmin candidates evaluated).
+
+    """
+
+    if(isinstance(series, PreparedSeries)):
+        sorted_series = series
+    else:
+        if(instrumentation is not None):
+            clock = perf_counter()
+        sorted_series = np.sort(np.asarray(series))
+        if(instrumentation is not None):
+            instrumentation.phase_finished("sorting", perf_counter() - clock)
+    return _search_sorted(sorted_series, min_size_series = min_size_series, discrete = discrete, search = search, max_candidates = max_candidates,
+                          xmin_range = xmin_range, instrumentation = instrumentation, backend = backend)
+
+def estimate_parameters(series, min_size_series = 50, discrete = False, instrumentation = None, search = "exhaustive", max_candidates = 200, xmin_range = None, backend = None):
     """
     
     Apply Clauset et al.'s method to find the best fit value of xmin and Alpha.
 
+    After sorting, the MLE of every xmin candidate is read off cumulative sums in O(N), but the KS statistics of a candidate is a maximum over its whole tail, so the exhaustive search over U distinct values costs O(N*U) for continuous data: about 2 seconds for 3*10^4 distinct values and 25 seconds for 10^5. For larger series, use search="quantile", "log" or "coarse_to_fine", which evaluate a bounded number of candidates (coarse_to_fine fits 10^6 values in a few seconds).
+
     **Parameters**
 
-        series : series of data to be fit.
+        series : series of data to be fit (list or numpy array, including numpy.memmap, or `powerlaw.prepared.PreparedSeries`). For series larger than memory, see `powerlaw.ingest.estimate_parameters_out_of_core()`.
         
         min_size_series : Minimum possible size of the distribution to which power-law fit will be attempted. Fitting power-law to a very small series would give biased results where power-law may appear to be a good fit even when data is not drawn from power-law distribution. The default value is taken to be 50 as suggested in the paper.
 
         discrete : Boolean, whether to treat series as discrete or continous. Default value is False
 
+        instrumentation : `powerlaw.instrumentation.Instrumentation` to report the candidates scanned and the time spent sorting, in the MLE and in the KS statistics to. Default value is None, ie no instrumentation.
+
+        search : Strategy to pick the xmin candidates, see `search_xmin()`. Default value is "exhaustive", ie every distinct value.
+
+        max_candidates : See `search_xmin()`.
+
+        xmin_range : Tuple of (lowest xmin, highest xmin) to restrict the candidates to, see `search_xmin()`. Default value is None
+
+        backend : Name of the engine of the scan over the xmin candidates, see `powerlaw.backends`: "numpy", "numba" (if installed) or "auto" for the fastest available one. Default value is None, ie the default backend, see `powerlaw.backends.set_backend()`.
+
     **Returns**
 
         Tuple of (Estimated xmin, Estimated Alpha value, minimum KS statistics score).
 
     """
 
-    sorted_series = sorted(series)
-    xmin_candidates = []
-    x_prev = sorted_series[0]
-    xmin_candidates.append(x_prev)
-    for x in sorted_series:
-        if(x>x_prev):
-            x_prev = x
-            xmin_candidates.append(x_prev)
-
-    ks_statistics_min = sys.maxsize;
-    xmin_result = 0
-    Alpha_result = 2
-    for xmin in xmin_candidates[:-1*(min_size_series-1)]: 
-        data =  [x for x in sorted_series if x>=xmin]
-        estimated_Alpha = estimate_scaling_parameter(data, xmin)
-        if(discrete):
-            Px = [zeta(estimated_Alpha, x)/zeta(estimated_Alpha, xmin) for x in unique(data)]
+    return tuple(search_xmin(series, min_size_series = min_size_series, discrete = discrete, search = search, max_candidates = max_candidates,
+                             xmin_range = xmin_range, instrumentation = instrumentation, backend = backend)[:3])
+
+def _estimate_sorted(sorted_series, min_size_series = 50, discrete = False, instrumentation = None, backend = None):
+    """
+
+    `estimate_parameters()` for a numpy array which is sorted already.
+
+    """
+
+    return tuple(_search_sorted(sorted_series, min_size_series = min_size_series, discrete = discrete, instrumentation = instrumentation, backend = backend)[:3])
+
+def _number_of_datasets(epsilon):
+    """
+
+    Number of synthetic datasets needed for a p-value accurate to within epsilon.
+
+    """
+
+    return int(round(0.25/(epsilon**2)) +1)
+
+# values below xmin of a series given as a histogram: distinct values, index of their first occurrence in the (never built) sorted series, and number of samples
+_HistogramPool = namedtuple("_HistogramPool", ["values", "first", "size"])
+
+def _histogram_pool(prepared, stop):
+    """
+
+    _HistogramPool of the first stop distinct values of a PreparedSeries built from a histogram.
+
+    """
+
+    first = len(prepared) - prepared.count_ge[:stop]
+    size = len(prepared) - (int(prepared.count_ge[stop]) if stop < len(prepared.count_ge) else 0)
+    return _HistogramPool(prepared.distinct_values[:stop], first, size)
+
+def _pool_size(non_powerlaw_series):
+    """
+
+    Number of samples of a sorted numpy array of values or of a _HistogramPool.
+
+    """
+
+    if(isinstance(non_powerlaw_series, _HistogramPool)):
+        return non_powerlaw_series.size
+    return len(non_powerlaw_series)
+
+def _split_series(series, xmin):
+    """
+
+    Split series for dataset generation.
+
+    **Returns**
+
+        Tuple of (sorted numpy array of values below xmin, or _HistogramPool for a histogram, size of the series, fraction of values >= xmin).
+
+    """
+
+    if(isinstance(series, PreparedSeries)):
+        n = len(series)
+        if(series.sorted_series is None):
+            non_powerlaw_series = _histogram_pool(series, int(np.searchsorted(series.distinct_values, xmin, side="left")))
         else:
-            Px = [pow(float(x)/xmin, 1 - estimated_Alpha ) for x in unique(data)]
-        n = len(Px)
-        Sx = [i[1]/n for i in frequency_distribution(data, pdf=False)]
-        ks_statistics = max( [abs(Sx[counter] - Px[counter]) for counter in range(0, n)] )
-        if(ks_statistics<ks_statistics_min):
-            ks_statistics_min = ks_statistics
-            xmin_result = xmin
-            Alpha_result = estimated_Alpha
+            non_powerlaw_series = series.below(xmin)
+    else:
+        series = np.asarray(series)
+        n = len(series)
+        non_powerlaw_series = np.sort(series[series<xmin])
+    ntail = n - _pool_size(non_powerlaw_series)
+    p = float(ntail)/n
+    return (non_powerlaw_series, n, p)
+
+def _dataset_seed(entropy, index):
+    """
+
+    Seed for the index-th synthetic dataset. Every dataset gets its own independent stream, spawned from the same root entropy, so the datasets do not depend on how they are split among workers.
+
+    """
+
+    return np.random.SeedSequence(entropy, spawn_key=(index,))
+
+def _dataset_dtype(non_powerlaw_series, discrete = False):
+    """
+
+    dtype of the synthetic datasets: integers for a discrete fit of integer data, floats otherwise.
 
-    return (xmin_result, Alpha_result, ks_statistics_min)
+    """
 
-def generate_dataset(series, xmin, alpha, epsilon = 0.01):
+    if(isinstance(non_powerlaw_series, _HistogramPool)):
+        non_powerlaw_series = non_powerlaw_series.values
+    return np.result_type(non_powerlaw_series.dtype, np.int64 if discrete else np.float64)
+
+def _synthetic_dataset(non_powerlaw_series, n, p, xmin, alpha, seed, discrete = False, out = None, sort = False):
+    """
+
+    Draw a single synthetic dataset for goodness_of_fit test, using the random stream given by seed.
+
+    **Parameters**
+
+        non_powerlaw_series : sorted numpy array of values (from the original series) below xmin, or _HistogramPool of them.
+
+        n : size of the dataset.
+
+        p : probability of drawing a value from the power-law tail.
+
+        xmin : xmin for the fitted power-law model.
+
+        alpha : alpha for the fitted power-law model.
+
+        seed : numpy.random.SeedSequence (or anything accepted by numpy.random.default_rng) for the dataset.
+
+        discrete : Boolean, whether to draw the power-law tail from the (exact) discrete power-law. Default value is False
+
+        out : numpy array of n values of dtype `_dataset_dtype()` to write the dataset into, eg a buffer reused across datasets. Default value is None, ie a new array.
+
+        sort : Boolean. If True, the dataset is sorted. As the body is drawn by index from the sorted values below xmin and every tail value is >= xmin, only the indices and the tail need sorting. Default value is False
+
+    **Returns**
+
+        numpy array of n values (out if given), the values below xmin first.
+
+    """
+
+    rng = np.random.default_rng(seed)
+    if(out is None):
+        out = np.empty(n, dtype=_dataset_dtype(non_powerlaw_series, discrete))
+    # how many numbers are to be picked from powerlaw distribution
+    count_powerlaw_series = int(rng.binomial(n, p))
+    count_body = n - count_powerlaw_series
+    # pick the rest from non_powerlaw_series, by index
+    indices = rng.integers(0, _pool_size(non_powerlaw_series), count_body) if count_body else np.zeros(0, dtype=np.int64)
+    if(sort):
+        indices.sort()
+    if(isinstance(non_powerlaw_series, _HistogramPool)):
+        # index in the sorted series -> index of its distinct value, the same draw as for the expanded series
+        (pool, indices) = (non_powerlaw_series.values, np.searchsorted(non_powerlaw_series.first, indices, side="right") - 1)
+    else:
+        pool = non_powerlaw_series
+    if(pool.dtype == out.dtype):
+        np.take(pool, indices, out=out[:count_body])
+    else:
+        # eg integer data fitted as continuous, np.take does not cast
+        out[:count_body] = pool[indices]
+    if(discrete):
+        out[count_body:] = discrete_powerlaw_array(Alpha = alpha, n = count_powerlaw_series, xmin = xmin, seed = rng)
+    else:
+        out[count_body:] = powerlaw_array(Alpha = alpha, n = count_powerlaw_series, xmin = xmin, seed = rng)
+    if(sort):
+        out[count_body:].sort()
+    return out
+
+def generate_dataset(series, xmin, alpha, epsilon = 0.01, seed = None, discrete = False, sort = False):
 
     """
     
@@ -134,7 +763,7 @@ def generate_dataset(series, xmin, alpha, epsilon = 0.01):
 
     **Parameters**
 
-        series : series of data on which the power-law model was fitted.
+        series : series of data on which the power-law model was fitted, or its `powerlaw.prepared.PreparedSeries`.
 
         xmin : xmin for the fitted power-law model.
 
@@ -142,38 +771,177 @@ def generate_dataset(series, xmin, alpha, epsilon = 0.01):
 
         epsilon : desired accuracy in p-value. Default is set to 0.01
 
+        seed : Integer to make the datasets reproducible. Default is None, in which case fresh entropy is used.
+
+        discrete : Boolean, whether the fitted model is a discrete power-law. Default value is False
+
+        sort : Boolean, whether to yield sorted datasets, at a small fraction of the cost of sorting them afterwards. Default value is False
+
     **Returns**
 
-        A generator to generate list of numbers (datasets).
+        A generator of numpy arrays (datasets). Each dataset is a new array, which may be kept.
 
     """
-    number_of_datasets = int(round(0.25/(epsilon**2)) +1)
-    print(number_of_datasets)
-    n = len(series)
-    non_powerlaw_series = [x for x in series if x<xmin]
-    ntail = n - len(non_powerlaw_series)
-    p = float(ntail)/n
-    # print p
-    # print ntail
-    # print n
+    number_of_datasets = _number_of_datasets(epsilon)
+    (non_powerlaw_series, n, p) = _split_series(series, xmin)
+    entropy = np.random.SeedSequence(seed).entropy
 
     for i in range(0, number_of_datasets):
-        dataset = []
-        count_powerlaw_series = 0
-        # how many numbers are to be picked from powerlaw distribution
-        for random_number in random_series(n):
-            if(random_number<=p):
-                count_powerlaw_series+=1
-                # generate number from power-law distribution
-            else:
-                # pick number from non_powerlaw_series
-              dataset.append(random.choice(non_powerlaw_series))
-        
-        dataset = dataset + [i for i in powerlaw_series(Alpha = alpha, xmin = xmin, n = count_powerlaw_series)]
+        yield _synthetic_dataset(non_powerlaw_series, n, p, xmin, alpha, _dataset_seed(entropy, i), discrete = discrete, sort = sort)
+
+def _fit_options(min_size_series = 50, discrete = False, search = "exhaustive", max_candidates = 200, xmin_range = None, backend = None):
+    """
+
+    Keyword arguments of `estimate_parameters()` the synthetic datasets are fitted with. backend is resolved here, so that worker processes use the backend of the calling process.
+
+    """
+
+    return {"min_size_series": min_size_series, "discrete": discrete, "search": search, "max_candidates": max_candidates, "xmin_range": xmin_range,
+            "backend": resolve_backend(backend)}
 
-        yield dataset
+def _bootstrap_ks_chunk(task):
+    """
+
+    Fit power-law to a contiguous range of synthetic datasets. This is the unit of work shipped to the worker processes by `_bootstrap_ks()`.
+
+    Memory does not grow with the number of datasets: every dataset is drawn (sorted) into the same array and fitted with the same scratch arrays, and only its xmin, alpha and KS statistics are kept.
+
+    **Parameters**
+
+        task : Tuple of (non_powerlaw_series, n, p, xmin, alpha, fit_options, entropy, start, stop, timed, track_memory), fit_options being the keyword arguments of `estimate_parameters()`.
+
+    **Returns**
+
+        Tuple of (numpy array with one row of (xmin, alpha, KS statistics) for each of the datasets start, start+1, ..., stop-1, dict of seconds spent per phase if timed else None, peak number of bytes allocated by the chunk if track_memory else None).
+
+    """
+
+    (non_powerlaw_series, n, p, xmin, alpha, fit_options, entropy, start, stop, timed, track_memory) = task
+    if(track_memory):
+        tracing = tracemalloc.is_tracing()
+        if(not tracing):
+            tracemalloc.start()
+        elif(hasattr(tracemalloc, "reset_peak")):
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    discrete = fit_options["discrete"]
+    metrics = Metrics() if timed else None
+    fits = np.empty((stop - start, 3))
+    dataset = np.empty(n, dtype=_dataset_dtype(non_powerlaw_series, discrete))
+    buffers = (np.empty(n, dtype=bool), np.empty(n), np.empty(n))
+    for i in range(start, stop):
+        if(timed):
+            clock = perf_counter()
+        _synthetic_dataset(non_powerlaw_series, n, p, xmin, alpha, _dataset_seed(entropy, i), discrete = discrete, out = dataset, sort = True)
+        if(timed):
+            metrics.phase_finished("sampling", perf_counter() - clock)
+        fits[i - start] = _search_sorted(dataset, instrumentation = metrics, buffers = buffers, **fit_options)[:3]
 
-def goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size_series = 50):
+    peak_memory = None
+    if(track_memory):
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        if(not tracing):
+            tracemalloc.stop()
+    return (fits, None if metrics is None else metrics.phase_seconds, peak_memory)
+
+def _bootstrap_tasks(series, xmin, alpha, number_of_datasets, fit_options, chunk_size, seed = None, timed = False, track_memory = False, first_dataset = 0, resample = False):
+    """
+
+    Generator of the tasks of `_bootstrap_ks_chunk()` covering the synthetic datasets first_dataset, ..., number_of_datasets-1, chunk_size datasets at a time. If resample is True, the datasets are drawn with replacement from the whole series (nonparametric bootstrap) rather than from the fitted model.
+
+    """
+
+    if(resample):
+        # a dataset with no power-law tail is a plain resample of the "body", here the whole sorted series
+        if(isinstance(series, PreparedSeries) and series.sorted_series is None):
+            non_powerlaw_series = _histogram_pool(series, len(series.distinct_values))
+        else:
+            non_powerlaw_series = series.sorted_series if isinstance(series, PreparedSeries) else np.sort(np.asarray(series))
+        (n, p) = (_pool_size(non_powerlaw_series), 0.0)
+    else:
+        (non_powerlaw_series, n, p) = _split_series(series, xmin)
+    # cast the pool once to the dtype of the datasets, so that every dataset takes the fast path of _synthetic_dataset()
+    dtype = _dataset_dtype(non_powerlaw_series, fit_options["discrete"])
+    if(isinstance(non_powerlaw_series, _HistogramPool)):
+        non_powerlaw_series = non_powerlaw_series._replace(values = non_powerlaw_series.values.astype(dtype, copy=False))
+    else:
+        non_powerlaw_series = non_powerlaw_series.astype(dtype, copy=False)
+    entropy = np.random.SeedSequence(seed).entropy
+    for start in range(first_dataset, number_of_datasets, chunk_size):
+        yield (non_powerlaw_series, n, p, xmin, alpha, fit_options, entropy, start, min(start + chunk_size, number_of_datasets), timed, track_memory)
+
+def _bootstrap_ks(series, xmin, alpha, number_of_datasets, fit_options, n_jobs = 1, chunk_size = None, seed = None, instrumentation = None, first_dataset = 0, fits = False, track_memory = False, resample = False):
+    """
+
+    Generator to fit power-law to synthetic datasets, serially or over a process pool.
+
+    **Parameters**
+
+        fit_options : dict of keyword arguments of `estimate_parameters()` (min_size_series, discrete, search, max_candidates, xmin_range and backend) to fit the synthetic datasets with, see `_fit_options()`.
+
+        n_jobs : Number of worker processes. 1 runs in the calling process, None or a negative value uses all CPUs.
+
+        chunk_size : Number of datasets handed to a worker at a time. Default is None, which splits the work into about four chunks per worker.
+
+        seed : See `generate_dataset()`.
+
+        instrumentation : `powerlaw.instrumentation.Instrumentation` the time spent in every phase by the workers is reported to, chunk by chunk. Default value is None
+
+        first_dataset : Index of the first synthetic dataset to fit, eg to resume an interrupted run. Default value is 0
+
+        fits : Boolean. If True, yield the xmin and alpha of the synthetic datasets as well as their KS statistics. Default value is False
+
+        track_memory : Boolean. If True, measure the peak memory allocated by every chunk with tracemalloc. Default value is False
+
+        resample : Boolean. If True, fit resamples of the series instead of synthetic datasets, see `_bootstrap_tasks()`. Default value is False
+
+        For the other parameters, see `goodness_of_fit()`.
+
+    **Returns**
+
+        A generator yielding numpy arrays of KS statistics of the synthetic datasets, chunk by chunk in dataset order. If fits is True, it yields tuples of (numpy array with one row of (xmin, alpha, KS statistics) per dataset, peak number of bytes allocated by the chunk or None) instead.
+
+    """
+
+    if(n_jobs is None or n_jobs < 0):
+        n_jobs = os.cpu_count() or 1
+    if(chunk_size is None):
+        chunk_size = max(int(ceil(float(number_of_datasets - first_dataset)/(4*n_jobs))), 1)
+
+    tasks = _bootstrap_tasks(series, xmin, alpha, number_of_datasets, fit_options, chunk_size, seed = seed, timed = instrumentation is not None,
+                             track_memory = track_memory, first_dataset = first_dataset, resample = resample)
+
+    def report(result):
+        (fits_chunk, phase_seconds, peak_memory) = result
+        if(instrumentation is not None):
+            for (phase, seconds) in phase_seconds.items():
+                instrumentation.phase_finished(phase, seconds)
+        if(fits):
+            return (fits_chunk, peak_memory)
+        return fits_chunk[:, 2]
+
+    if(n_jobs == 1):
+        for task in tasks:
+            yield report(_bootstrap_ks_chunk(task))
+    else:
+        # keep only a couple of chunks per worker in flight so that a consumer which stops early does not wait for the whole run
+        executor = ProcessPoolExecutor(max_workers = n_jobs)
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(executor.submit(_bootstrap_ks_chunk, task))
+                if(len(pending) >= 2*n_jobs):
+                    yield report(pending.popleft().result())
+            while pending:
+                yield report(pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+
+def goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size_series = 50, discrete = False, n_jobs = 1, chunk_size = None, seed = None, instrumentation = None, checkpoint = None, checkpoint_every = 1000,
+                    search = "exhaustive", max_candidates = 200, xmin_range = None, backend = None):
 
     """
     
@@ -181,7 +949,7 @@ def goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size
 
     **Parameters**
 
-        series : series of data on which the power-law model was fitted.
+        series : series of data on which the power-law model was fitted, or its `powerlaw.prepared.PreparedSeries`.
 
         xmin : xmin for the fitted power-law model.
 
@@ -193,23 +961,234 @@ def goodness_of_fit(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size
 
         min_size_series : Minimum possible size of the distribution to which power-law fit will be attempted. This value is used when fitting power-law to the generated datasets. The default value is taken to be 50. For further details, see `estimate_parameters()`.
 
+        discrete : Boolean, whether the fitted model is a discrete power-law. The synthetic tails are then drawn from the exact discrete power-law and fitted as discrete. Default value is False
+
+        n_jobs : Number of worker processes the synthetic datasets are spread over. Default is 1 (no process pool). None or a negative value uses all CPUs.
+
+        chunk_size : Number of synthetic datasets handed to a worker at a time. Default is None, which gives about four chunks per worker.
+
+        seed : Integer to make the p-value reproducible. For a given seed, the p-value is the same whatever the value of n_jobs and chunk_size. Default is None.
+
+        instrumentation : `powerlaw.instrumentation.Instrumentation` to report the datasets completed, the running p-value and the time spent per phase to, chunk by chunk. Default value is None, ie no instrumentation.
+
+        checkpoint : Path of a checkpoint file (.npz) to make the test resumable. The KS statistics of the synthetic datasets completed so far and the random state are saved there, and a later call with the same path, data and parameters continues where the previous one stopped, giving the same p-value as an uninterrupted run. Default value is None, ie no checkpoint.
+
+        checkpoint_every : Minimum number of synthetic datasets completed between two saves of the checkpoint. The checkpoint is also saved at the end of the test. Default value is 1000
+
+        search, max_candidates, xmin_range : xmin search strategy the synthetic datasets are fitted with, see `search_xmin()`. They should match the ones the model was fitted with. Default is the exhaustive search of the paper.
+
+        backend : Backend the synthetic datasets are fitted with, see `estimate_parameters()`. Default value is None, ie the default backend.
+
     **Returns**
 
         p-value for the fitted model.
 
     """
 
-    count_dataset = 0.0
+    number_of_datasets = _number_of_datasets(epsilon)
+    if(instrumentation is not None):
+        instrumentation.bootstrap_started(number_of_datasets)
+
+    # KS statistics of the synthetic datasets, only kept for the checkpoint
+    completed = []
+    if(checkpoint is not None):
+        # imported here as powerlaw.cache builds on this module
+        from .cache import fingerprint
+        # fingerprint of the sorted values, as the test does not depend on the order of the series
+        series = prepare_series(series)
+        parameters = {"n": len(series), "fingerprint": fingerprint(series), "xmin": float(xmin), "alpha": float(alpha), "ks_statistics": float(ks_statistics), "number_of_datasets": number_of_datasets,
+                      "min_size_series": int(min_size_series), "discrete": bool(discrete), "seed": None if seed is None else int(seed),
+                      "search": search, "max_candidates": int(max_candidates), "xmin_range": None if xmin_range is None else list(xmin_range)}
+        state = load_checkpoint(checkpoint, parameters)
+        if(state is None):
+            seed = np.random.SeedSequence(seed).entropy
+        else:
+            (seed, ks_statistics_completed) = state
+            completed.append(ks_statistics_completed)
+
+    count_dataset = float(sum(len(ks_statistics_dataset) for ks_statistics_dataset in completed))
     # number of synthetic datasets tested
-    n1 = 0.0
+    n1 = float(sum(int(np.count_nonzero(ks_statistics_dataset>ks_statistics)) for ks_statistics_dataset in completed))
     # number of synthetic datasets where ks value is greater than ks value for given data 
-    for dataset in generate_dataset(series=series, xmin=xmin, alpha=alpha, epsilon=epsilon):
-        count_dataset+=1.0
-        (xmin_dataset, alpha_dataset, ks_statistics_dataset) = estimate_parameters(series=dataset, min_size_series = min_size_series)
-        if(ks_statistics_dataset>ks_statistics):
-            n1+=1.0
+    count_saved = count_dataset
+    for ks_statistics_dataset in _bootstrap_ks(series=series, xmin=xmin, alpha=alpha, number_of_datasets=number_of_datasets,
+                                               fit_options=_fit_options(min_size_series, discrete, search, max_candidates, xmin_range, backend), n_jobs=n_jobs, chunk_size=chunk_size, seed=seed,
+                                               instrumentation=instrumentation, first_dataset=int(count_dataset)):
+        count_dataset+=len(ks_statistics_dataset)
+        n1+=int(np.count_nonzero(ks_statistics_dataset>ks_statistics))
+        if(instrumentation is not None):
+            instrumentation.datasets_completed(int(count_dataset), number_of_datasets, int(n1))
+        if(checkpoint is not None):
+            completed.append(ks_statistics_dataset)
+            if(count_dataset - count_saved >= checkpoint_every or count_dataset == number_of_datasets):
+                save_checkpoint(checkpoint, parameters, seed, np.concatenate(completed))
+                count_saved = count_dataset
     return n1/count_dataset
 
+BootstrapResult = namedtuple("BootstrapResult", ["p_value", "ks_statistics", "xmin", "alpha", "peak_memory"])
+
+_BOOTSTRAP_METHODS = ("parametric", "nonparametric")
+
+def bootstrap(series, xmin, alpha, ks_statistics, epsilon = 0.01, min_size_series = 50, discrete = False, n_jobs = 1, chunk_size = None, seed = None, instrumentation = None,
+              search = "exhaustive", max_candidates = 200, xmin_range = None, track_memory = False, method = "parametric", number_of_datasets = None, backend = None):
+
+    """
+
+    `goodness_of_fit()` which also returns the fit of every synthetic dataset and, optionally, how much memory a worker needed. The fits give the uncertainty of xmin and alpha, see `parameter_uncertainty()`, so a single pass yields both the p-value and the standard errors.
+
+    Synthetic datasets are generated, fitted and discarded one at a time in arrays allocated once per chunk, so the memory used by a worker depends on the size of the series only, not on the number of datasets. Only the xmin, alpha and KS statistics of every dataset are kept.
+
+    **Parameters**
+
+        track_memory : Boolean. If True, the peak memory allocated by every chunk is measured with tracemalloc, which slows down allocations somewhat. Default value is False
+
+        method : How the datasets are drawn. Default value is "parametric"
+            "parametric" : from the fitted model, as in `goodness_of_fit()` (values below xmin are resampled from the data, values above from the fitted power-law).
+            "nonparametric" : with replacement from the series. There is no p-value then.
+
+        number_of_datasets : Integer, number of datasets to fit. Default value is None, ie the number `goodness_of_fit()` uses for epsilon.
+
+        For the other parameters, see `goodness_of_fit()`. For a given seed and the default method and number_of_datasets, the p-value is the same as the one of `goodness_of_fit()`.
+
+    **Returns**
+
+        BootstrapResult named tuple of (p-value or None for the nonparametric method, numpy array of the KS statistics of the datasets, numpy array of their xmin, numpy array of their alpha, peak number of bytes allocated by a chunk of datasets, ie the working memory a worker needs beyond the series itself, or None if track_memory is False).
+
+    """
+
+    if(method not in _BOOTSTRAP_METHODS):
+        raise ValueError("method should be one of "+", ".join(_BOOTSTRAP_METHODS)+", got "+str(method))
+    if(number_of_datasets is None):
+        number_of_datasets = _number_of_datasets(epsilon)
+    if(instrumentation is not None):
+        instrumentation.bootstrap_started(number_of_datasets)
+
+    fits = np.empty((number_of_datasets, 3))
+    count_dataset = 0
+    n1 = 0
+    peak_memory = None
+    for (fits_chunk, peak_memory_chunk) in _bootstrap_ks(series=series, xmin=xmin, alpha=alpha, number_of_datasets=number_of_datasets,
+                                                         fit_options=_fit_options(min_size_series, discrete, search, max_candidates, xmin_range, backend), n_jobs=n_jobs, chunk_size=chunk_size, seed=seed,
+                                                         instrumentation=instrumentation, fits=True, track_memory=track_memory, resample=(method == "nonparametric")):
+        fits[count_dataset:count_dataset + len(fits_chunk)] = fits_chunk
+        count_dataset += len(fits_chunk)
+        n1 += int(np.count_nonzero(fits_chunk[:, 2]>ks_statistics))
+        if(peak_memory_chunk is not None):
+            peak_memory = max(peak_memory or 0, peak_memory_chunk)
+        if(instrumentation is not None):
+            instrumentation.datasets_completed(count_dataset, number_of_datasets, n1)
+    p_value = float(n1)/count_dataset if method == "parametric" else None
+    return BootstrapResult(p_value, fits[:, 2].copy(), fits[:, 0].copy(), fits[:, 1].copy(), peak_memory)
+
+ParameterUncertainty = namedtuple("ParameterUncertainty", ["xmin_standard_error", "xmin_interval", "alpha_standard_error", "alpha_interval", "number_of_datasets"])
+
+def parameter_uncertainty(result, confidence = 0.95):
+    """
+
+    Standard errors and percentile intervals of xmin and alpha from the fits of the datasets of `bootstrap()`. Datasets for which no power-law could be fitted (too few distinct values) are left out.
+
+    **Parameters**
+
+        result : BootstrapResult returned by `bootstrap()`, with either method.
+
+        confidence : Coverage of the percentile intervals. Default value is 0.95
+
+    **Returns**
+
+        ParameterUncertainty named tuple of (standard error of xmin, (lower, upper) bounds of xmin, standard error of alpha, (lower, upper) bounds of alpha, number of datasets used).
+
+    """
+
+    fitted = result.ks_statistics < sys.maxsize
+    xmins = result.xmin[fitted]
+    alphas = result.alpha[fitted]
+    if(len(xmins) < 2):
+        return ParameterUncertainty(float("nan"), (float("nan"), float("nan")), float("nan"), (float("nan"), float("nan")), len(xmins))
+    quantiles = [(1.0 - confidence)/2.0, (1.0 + confidence)/2.0]
+    return ParameterUncertainty(float(np.std(xmins, ddof=1)), tuple(np.quantile(xmins, quantiles).tolist()),
+                                float(np.std(alphas, ddof=1)), tuple(np.quantile(alphas, quantiles).tolist()), len(xmins))
+
+PValueEstimate = namedtuple("PValueEstimate", ["p_value", "lower", "upper", "number_of_datasets"])
+
+def _p_value_interval(n1, count_dataset, confidence):
+    """
+
+    Clopper-Pearson interval for the p-value, given n1 exceedances among count_dataset synthetic datasets.
+
+    """
+
+    tail = (1.0 - confidence)/2.0
+    lower = 0.0 if n1 == 0 else float(betaincinv(n1, count_dataset - n1 + 1, tail))
+    upper = 1.0 if n1 == count_dataset else float(betaincinv(n1 + 1, count_dataset - n1, 1.0 - tail))
+    return (lower, upper)
+
+def sequential_goodness_of_fit(series, xmin, alpha, ks_statistics, significance = 0.1, confidence = 0.95, epsilon = 0.01, min_size_series = 50, discrete = False, n_jobs = 1, chunk_size = 25, seed = None, instrumentation = None,
+                               search = "exhaustive", max_candidates = 200, xmin_range = None, backend = None):
+
+    """
+
+    Sequential version of `goodness_of_fit()`. Synthetic datasets are fitted chunk by chunk and the test stops as soon as a confidence interval on the running p-value lies entirely above or below the significance threshold, ie as soon as the decision to reject (or not reject) the power-law is settled.
+
+    At most as many datasets as `goodness_of_fit()` would use for the given epsilon are generated. The interval is checked after every chunk and its level is corrected (Bonferroni) for the number of checks, so the overall confidence is at least the one asked for.
+
+    **Parameters**
+
+        series : series of data on which the power-law model was fitted, or its `powerlaw.prepared.PreparedSeries`.
+
+        xmin : xmin for the fitted power-law model.
+
+        alpha : alpha for the fitted power-law model.
+
+        ks_statistics : KS statistics for the fitted power-law model.
+
+        significance : p-value threshold below which the power-law is ruled out. Default is 0.1 as suggested in the paper.
+
+        confidence : Confidence level of the decision. Default is 0.95.
+
+        epsilon : desired accuracy in p-value if the test has to run to completion. Default is set to 0.01.
+
+        min_size_series : See `goodness_of_fit()`.
+
+        discrete : See `goodness_of_fit()`.
+
+        n_jobs : See `goodness_of_fit()`.
+
+        chunk_size : Number of synthetic datasets fitted between two checks. Default is 25.
+
+        seed : See `goodness_of_fit()`. For a given seed, the result does not depend on n_jobs.
+
+        instrumentation : See `goodness_of_fit()`.
+
+        search, max_candidates, xmin_range, backend : See `goodness_of_fit()`.
+
+    **Returns**
+
+        PValueEstimate named tuple of (p-value, lower bound, upper bound, number of synthetic datasets used).
+
+    """
+
+    number_of_datasets = _number_of_datasets(epsilon)
+    number_of_checks = int(ceil(float(number_of_datasets)/chunk_size))
+    confidence_per_check = 1.0 - (1.0 - confidence)/number_of_checks
+
+    if(instrumentation is not None):
+        instrumentation.bootstrap_started(number_of_datasets)
+
+    count_dataset = 0
+    n1 = 0
+    (lower, upper) = (0.0, 1.0)
+    for ks_statistics_dataset in _bootstrap_ks(series=series, xmin=xmin, alpha=alpha, number_of_datasets=number_of_datasets,
+                                               fit_options=_fit_options(min_size_series, discrete, search, max_candidates, xmin_range, backend), n_jobs=n_jobs, chunk_size=chunk_size, seed=seed,
+                                               instrumentation=instrumentation):
+        count_dataset+=len(ks_statistics_dataset)
+        n1+=int(np.count_nonzero(ks_statistics_dataset>ks_statistics))
+        if(instrumentation is not None):
+            instrumentation.datasets_completed(count_dataset, number_of_datasets, n1)
+        (lower, upper) = _p_value_interval(n1, count_dataset, confidence_per_check)
+        if(upper < significance or lower > significance):
+            break
+    return PValueEstimate(float(n1)/count_dataset, lower, upper, count_dataset)
+
 
 if __name__ == "__main__":
     n = 10
@@ -0,0 +1,157 @@
+import numpy as np
+
+from .discrete import discrete_ccdf, estimate_discrete_scaling_parameter
+
+import sys
+
+class StreamingFit(object):
+    """
+
+    Incremental power-law fitter for unbounded streams, eg the generators in `powerlaw.distribution` with n < 0.
+
+    Values are fed in batches with `update()` and the current fit is read with `result()` at any time. Memory does not grow with the length of the stream.
+
+    With a fixed xmin, a running sum of log(x) and a count of the values >= xmin are kept, so Alpha is the exact MLE. Without xmin, values are summarized in a log-binned sketch which keeps, for every bin, the number of values and the exact sum of their logs. xmin candidates are the bin edges: Alpha for a candidate is the exact MLE for that xmin, while the KS statistics is evaluated at the bin edges only and is therefore approximate.
+
+    **Parameters**
+
+        xmin : Float/Integer, xmin for the distribution if known before-hand. Default value is None, in which case xmin is searched for.
+
+        discrete : Boolean, whether to treat series as discrete or continous. Default value is False
+
+        min_size_series : Minimum possible size of the tail to which power-law fit will be attempted when searching for xmin. See `powerlaw.regression.estimate_parameters()`. Default value is 50.
+
+        bins_per_decade : Integer, resolution of the log-binned sketch. Default value is 50.
+
+    """
+
+    def __init__(self, xmin = None, discrete = False, min_size_series = 50, bins_per_decade = 50):
+        self.xmin = xmin
+        self.discrete = discrete
+        self.min_size_series = min_size_series
+        self.bins_per_decade = bins_per_decade
+        # number of values seen, including those which can not be part of any tail (x <= 0)
+        self.count = 0
+        self._tail_count = 0
+        self._tail_log_sum = 0.0
+        # bin index -> [count, sum of log(x)]
+        self._bins = {}
+
+    def update(self, batch):
+        """
+
+        Add a batch of values to the fit.
+
+        **Parameters**
+
+            batch : list, numpy array or any iterable of values.
+
+        **Returns**
+
+            self, so that calls can be chained.
+
+        """
+
+        if hasattr(batch, "__len__"):
+            batch = np.asarray(batch, dtype=float)
+        else:
+            batch = np.fromiter(batch, dtype=float)
+        self.count += len(batch)
+
+        batch = batch[batch > 0]
+        log_batch = np.log(batch)
+        if self.xmin is not None:
+            in_tail = batch >= self.xmin
+            self._tail_count += int(np.count_nonzero(in_tail))
+            self._tail_log_sum += float(np.sum(log_batch[in_tail]))
+
+        index = np.floor(log_batch*(self.bins_per_decade/np.log(10.0))).astype(np.int64)
+        (bin_index, inverse) = np.unique(index, return_inverse=True)
+        counts = np.bincount(inverse)
+        log_sums = np.bincount(inverse, weights=log_batch)
+        for (i, count, log_sum) in zip(bin_index.tolist(), counts.tolist(), log_sums.tolist()):
+            summary = self._bins.setdefault(i, [0, 0.0])
+            summary[0] += count
+            summary[1] += log_sum
+        return self
+
+    def _sketch(self):
+        """
+
+        Sketch as arrays of (bin lower edges, count of values >= edge, sum of log(x) over values >= edge), sorted by edge.
+
+        """
+
+        bin_index = np.array(sorted(self._bins), dtype=float)
+        counts = np.array([self._bins[i][0] for i in sorted(self._bins)], dtype=float)
+        log_sums = np.array([self._bins[i][1] for i in sorted(self._bins)], dtype=float)
+        edges = np.power(10.0, bin_index/self.bins_per_decade)
+        if self.discrete:
+            # every integer above a bin edge is >= its ceiling, so the tail sums stay exact
+            edges = np.ceil(edges)
+        return (edges, np.cumsum(counts[::-1])[::-1], np.cumsum(log_sums[::-1])[::-1])
+
+    def _alphas(self, xmins, log_sums, counts):
+        """
+
+        MLE of Alpha for every xmin, from the count and the sum of log(x) of the values >= xmin.
+
+        """
+
+        if self.discrete:
+            return estimate_discrete_scaling_parameter(xmins, log_sums, counts)
+        return 1.0 + counts/(log_sums - counts*np.log(xmins))
+
+    def _ks_statistics(self, xmin, alpha, tail_count, edges, count_ge):
+        """
+
+        KS statistics between the sketch and the fitted model, evaluated at the bin edges above xmin.
+
+        """
+
+        above = edges > xmin
+        if not np.any(above):
+            return 0.0
+        Sx = count_ge[above]/float(tail_count)
+        if self.discrete:
+            Px = discrete_ccdf(alpha, xmin, edges[above])
+        else:
+            Px = np.power(edges[above]/float(xmin), 1.0 - alpha)
+        return float(np.max(np.abs(Sx - Px)))
+
+    def result(self):
+        """
+
+        Current fit.
+
+        **Returns**
+
+            Tuple of (xmin, Estimated Alpha value, KS statistics score), as `powerlaw.regression.estimate_parameters()`. If there is not enough data to fit, (0, 2, sys.maxsize) is returned.
+
+        """
+
+        (edges, count_ge, log_sum_ge) = self._sketch()
+
+        if self.xmin is not None:
+            if self._tail_count == 0:
+                return (0, 2, sys.maxsize)
+            alpha = float(self._alphas(np.array([float(self.xmin)]), np.array([self._tail_log_sum]), np.array([float(self._tail_count)]))[0])
+            return (self.xmin, alpha, self._ks_statistics(self.xmin, alpha, self._tail_count, edges, count_ge))
+
+        # the last bin is never a candidate, as its values need not be distinct
+        candidates = np.flatnonzero(count_ge[:-1] >= self.min_size_series)
+        if self.discrete:
+            # several small bins may share the same integer edge, keep the first of them
+            candidates = candidates[np.unique(edges[candidates], return_index=True)[1]]
+        if len(candidates) == 0:
+            return (0, 2, sys.maxsize)
+        alphas = self._alphas(edges[candidates], log_sum_ge[candidates], count_ge[candidates])
+
+        (xmin_result, alpha_result, ks_statistics_min) = (0, 2, sys.maxsize)
+        for (index, alpha) in zip(candidates, alphas):
+            ks_statistics = self._ks_statistics(edges[index], alpha, count_ge[index], edges, count_ge)
+            if ks_statistics < ks_statistics_min:
+                (xmin_result, alpha_result, ks_statistics_min) = (edges[index].item(), float(alpha), ks_statistics)
+        if self.discrete:
+            xmin_result = int(xmin_result)
+        return (xmin_result, alpha_result, ks_statistics_min)
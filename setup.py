@@ -8,6 +8,6 @@ setup(
     author='Shagun Sodhani',
     author_email='sshagunsodhani@gmail.com',
     url='http://www.github.com/shagunsodhani/powerlaw',
-    requires=['numpy', 'matplotlib', 'sklearn'],
+    requires=['numpy', 'scipy', 'matplotlib'],
     long_description=open('README.md').read(),
 )
\ No newline at end of file